@@ -2,13 +2,10 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
-import folium
-from streamlit_folium import st_folium
-from streamlit_gsheets import GSheetsConnection
 import datetime
 import calendar
+from utils import get_css
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -19,150 +16,8 @@ st.set_page_config(
 )
 
 # --- CSS / Aesthetics (Robinhood Theme) ---
-st.markdown("""
-<style>
-    /* Global Background */
-    .stApp {
-        font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-    }
-
-    /* Metrics */
-    .stMetric {
-        background-color: #111;
-        border-radius: 8px;
-        padding: 10px 15px;
-        border: 1px solid #222;
-        margin-bottom: 10px;
-    }
-    .stMetric label {
-        color: #8C8C8C !important;
-        font-size: 0.85rem;
-    }
-    .stMetric div[data-testid="stMetricValue"] {
-        color: #00C805 !important; /* Robinhood Green */
-        font-size: 1.5rem;
-        font-weight: 600;
-    }
-    
-    /* Feed Card */
-    .feed-card {
-        background-color: #111;
-        border-bottom: 1px solid #222;
-        padding: 15px;
-        margin-bottom: 5px;
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-    }
-    .feed-date {
-        color: #8C8C8C;
-        font-size: 0.8rem;
-        margin-bottom: 4px;
-    }
-    .feed-title {
-        color: #FFFFFF;
-        font-size: 1.0rem;
-        font-weight: 500;
-    }
-    .feed-stats {
-        color: #00C805;
-        font-size: 0.9rem;
-        font-weight: 500;
-        text-align: right;
-    }
-    .feed-substats {
-        color: #8C8C8C;
-        font-size: 0.8rem;
-        text-align: right;
-    }
-
-    /* Progress Bar */
-    .stProgress > div > div > div > div {
-        background-color: #00C805;
-    }
-
-    /* Headers */
-    h1 { color: #FFFFFF !important; font-weight: 700; font-size: 2rem; }
-    h2, h3 { color: #FFFFFF !important; font-weight: 600; }
-    
-    /* Fire Grid */
-    .fire-grid-cell {
-        text-align: center;
-        padding: 4px;
-        font-size: 0.75rem;
-        color: #444;
-        border-radius: 4px;
-    }
-    .fire-active {
-        background-color: #00C80520; /* Low opacity green bg */
-        color: #FFFFFF;
-        border: 1px solid #00C805;
-    }
-    
-    /* Remove top margin for cleaner look */
-    .block-container {
-        padding-top: 2rem;
-    }
-    
-    /* Radio Button as Horizontal Pills (Approximate via Streamlit standard layout) */
-    div[role="radiogroup"] {
-        display: flex;
-        flex-direction: row;
-        gap: 20px;
-    }
-
-    /* --- MOBILE OPTIMIZATION --- */
-    @media (max-width: 640px) {
-        /* 1. Reduce padding to maximize space */
-        .block-container {
-            padding-left: 0.2rem !important;
-            padding-right: 0.2rem !important;
-            padding-top: 0.5rem !important;
-        }
-
-        /* 2. Scale down Headers */
-        h1 { font-size: 1.5rem !important; margin-bottom: 0.5rem !important; }
-        h2 { font-size: 1.3rem !important; }
-        h3 { font-size: 1.1rem !important; }
-
-        /* 3. Scale down Metrics & text */
-        .stMetric { padding: 8px !important; }
-        .stMetric label { font-size: 0.7rem !important; }
-        .stMetric div[data-testid="stMetricValue"] { font-size: 1.2rem !important; }
-        
-        /* 4. Touch Targets - Make buttons taller/easier to tap */
-        div[data-testid="stButton"] > button {
-            min-height: 45px !important;
-            font-size: 1rem !important;
-            margin-bottom: 8px !important;
-        }
-        
-        /* 5. Coach Card Adaptation */
-        .coach-card {
-            padding: 8px !important;
-            margin-bottom: 5px !important;
-        }
-        .coach-header { font-size: 0.9rem !important; margin-bottom: 2px !important; }
-        
-        /* 6. Calendar & Feed */
-        .fire-grid-cell { font-size: 0.65rem !important; padding: 1px !important; }
-        .feed-card { padding: 10px !important; }
-        
-        /* 7. Tabs - easier scrolling */
-        .stTabs [data-baseweb="tab-list"] {
-            gap: 2px !important;
-        }
-        .stTabs [data-baseweb="tab"] {
-            padding-left: 10px !important;
-            padding-right: 10px !important;
-            font-size: 0.8rem !important;
-        }
-    }
-    
-
-    
-</style>
-""", unsafe_allow_html=True)
+# All page styles live in styles/dashboard.css so each rerun emits a single style element
+st.markdown(get_css("dashboard.css"), unsafe_allow_html=True)
 
 # --- Helper Functions (Global) ---
 def format_duration_hm(minutes):
@@ -173,18 +28,27 @@ def format_duration_hm(minutes):
     mins = int(minutes % 60)
     return f"{hours}h {mins:02d}m"
 
+def format_duration_hm_array(minutes):
+    """Vectorized format_duration_hm over an array of minutes"""
+    mins = np.asarray(minutes, dtype=float).astype(np.int64)
+    hm = np.char.add(np.char.add((mins // 60).astype(str), 'h '), np.char.add(np.char.zfill((mins % 60).astype(str), 2), 'm'))
+    return np.where(mins >= 60, hm, np.char.add(mins.astype(str), 'm'))
+
 def format_duration_ms(minutes):
-    """Formats minutes into M:S (for pace)"""
-    mins = int(minutes)
-    secs = int((minutes - mins) * 60)
-    return f"{mins}:{secs:02d}"
+    """Formats minutes into M:S (for pace); vectorized over an array of minutes"""
+    minutes = np.asarray(minutes, dtype=float)
+    mins = minutes.astype(np.int32)
+    secs = ((minutes - mins) * 60).astype(np.int32)
+    return np.char.add(np.char.add(mins.astype(str), ':'), np.char.zfill(secs.astype(str), 2))
 
-from utils import load_data, calculate_physiology, increment_page_views, render_sticky_nav
+from utils import load_data, load_data_by_category, load_year_stats, EMPTY_YEAR_STATS, FRAME_HASH_FUNCS, compute_pmc, increment_page_views, render_sticky_nav
 
 # --- Sticky Top Navigation ---
 render_sticky_nav("dashboard")
 
-df = load_data()
+# Activities pre-split by category once in the cached loader; 'All' is the full frame
+df_by_cat = load_data_by_category()
+df = df_by_cat["All"]
 
 # --- Page View Counter ---
 if 'page_views' not in st.session_state:
@@ -213,21 +77,48 @@ st.markdown(f"""
     </div>
 """, unsafe_allow_html=True)
 
+# Page-level caches derived from df; filled in where they are defined further down
+DERIVED_CACHES = []
+
+# The loaders are cached for 10 minutes; this pulls freshly synced activities immediately
+def refresh_data():
+    load_data.clear()
+    load_data_by_category.clear()
+    load_year_stats.clear()
+    for cached_fn in DERIVED_CACHES: cached_fn.clear()
+
+st.button("🔄 Refresh Data", on_click=refresh_data, key="btn_refresh_data")
+
 if df.empty:
     st.warning("No data found. Please run the sync script.")
     st.stop()
 
+# --- Activity Masks ---
+# Filter choices map onto the Category column load_data precomputes: one categorical equality, no string scans.
+ACTIVITY_CATEGORY = {
+    "Running": 'running',
+    "Strength Training": 'strength',
+    "Walking/Hiking": 'walking_hiking',
+    "Other": 'other',
+}
+
+def apply_activity_filter(df, activity_filter):
+    """The one activity filter: rows of df (or any row subset) matching a UI choice; 'All' passes through."""
+    if activity_filter not in ACTIVITY_CATEGORY: return df
+    return df[df['Category'] == ACTIVITY_CATEGORY[activity_filter]]
+
+def filter_activities(activity, year=None, month=None):
+    """Activity filter plus optional year/month: a df_by_cat lookup, then masks over that subset only."""
+    frame = df_by_cat[ACTIVITY_CATEGORY.get(activity, "All")]
+    if year is not None: frame = frame[frame['Year'] == year]
+    if month is not None: frame = frame[frame['Month'] == month]
+    return frame
+
 # --- Global Physiology Calculations ---
-# Calculated in utils to ensure consistency across pages
+# Calculated (and cached) in utils to ensure consistency across pages
 try:
-    df_phys = calculate_physiology(df)
-    
-    current_metrics = df_phys.iloc[-1]
-    curr_ctl = current_metrics['CTL']
-    curr_atl = current_metrics['ATL']
-    curr_tsb = current_metrics['TSB']
-    load_ratio = curr_atl / curr_ctl if curr_ctl > 0 else 0
-    
+    df_phys, curr_ctl, curr_atl, curr_tsb, load_ratio = compute_pmc(df)
+
     if 0.8 <= load_ratio <= 1.3:
         status_text = "Optimal"
         status_color = "#00C805"
@@ -242,33 +133,13 @@ try:
         status_color = "#8C8C8C"
 
 except Exception as e:
+    df_phys = pd.DataFrame(columns=['Date', 'TRIMP', 'CTL', 'ATL', 'TSB'])
     curr_ctl, curr_atl, curr_tsb, load_ratio = 0, 0, 0, 0
     status_text = "N/A"
     status_color = "#8C8C8C"
 
 st.markdown("---")
 
-# --- Custom Navigation ---
-st.markdown("""
-<style>
-div[data-testid="stColumn"] > div > div > div > div {
-    gap: 0.5rem;
-}
-.nav-btn {
-    width: 100%;
-    border: 1px solid #333;
-    background: #181b1f;
-    color: white;
-    padding: 10px;
-    text-align: center;
-    border-radius: 5px;
-    cursor: pointer;
-    text-decoration: none;
-    display: block;
-}
-</style>
-""", unsafe_allow_html=True)
-
 
 # ==========================================
 # ROW 1: TRAINING STATUS
@@ -277,6 +148,37 @@ st.subheader("Training Status")
 
 # --- 1. AI Coach (Full Width) ---
 import google.generativeai as genai
+import threading
+
+@st.cache_resource
+def get_gemini_models():
+    """
+    Configures Gemini once per process and returns model handles in preference order.
+    Shared across sessions so reruns and new users skip client setup.
+    """
+    # Load environment from .env if available (Local fallback)
+    from dotenv import load_dotenv
+    import os
+    load_dotenv()
+    
+    GENAI_API_KEY = None
+    if "GEMINI_API_KEY" in st.secrets:
+        GENAI_API_KEY = st.secrets["GEMINI_API_KEY"]
+    else:
+        GENAI_API_KEY = os.getenv("GEMINI_API_KEY")
+        
+    if not GENAI_API_KEY:
+        return []
+        
+    genai.configure(api_key=GENAI_API_KEY)
+    
+    # Try Flash models first, then standard Pro if needed. A tuple: the shared handles are never reordered
+    return tuple(genai.GenerativeModel(m) for m in ['gemini-1.5-flash', 'gemini-2.0-flash-exp', 'gemini-2.0-flash'])
+
+@st.cache_resource
+def gemini_preference():
+    """Index of the model that last answered, shared across sessions; read and written under its lock."""
+    return {"index": 0, "lock": threading.Lock()}
 
 # Caching the expensive API call (6 hours = 21600 seconds)
 @st.cache_data(ttl=21600, show_spinner="Summoning the Coach...")
@@ -285,42 +187,26 @@ def ask_gemini_coach(prompt_text):
     Calls Gemini API with caching.
     Raises exception on failure so bad results aren't cached.
     """
-    try:
-        # Load environment from .env if available (Local fallback)
-        from dotenv import load_dotenv
-        import os
-        load_dotenv()
-        
-        GENAI_API_KEY = None
-        if "GEMINI_API_KEY" in st.secrets:
-            GENAI_API_KEY = st.secrets["GEMINI_API_KEY"]
-        else:
-            GENAI_API_KEY = os.getenv("GEMINI_API_KEY")
-            
-        if not GENAI_API_KEY:
-             # Graceful degradation if key is missing
-             return "Coach is offline (Missing API Key)."
-             
-        genai.configure(api_key=GENAI_API_KEY)
-        
-        # Try Flash models first, then standard Pro if needed
-        models = ['gemini-1.5-flash', 'gemini-2.0-flash-exp', 'gemini-2.0-flash'] 
-        
-        for m in models:
-            try:
-                model = genai.GenerativeModel(m)
-                response = model.generate_content(prompt_text)
-                return response.text
-            except Exception as e:
-                # Check for rate limits specifically to fail fast if needed? 
-                # Or just let the loop continue.
-                continue
-        
-        # If we get here, all models failed
-        raise Exception("All Gemini models failed to respond.")
-        
-    except Exception as outer_e:
-        raise outer_e
+    models = get_gemini_models()
+    if not models:
+        # Graceful degradation if key is missing
+        return "Coach is offline (Missing API Key)."
+    
+    pref = gemini_preference()
+    with pref["lock"]: first = pref["index"]
+    order = [first] + [i for i in range(len(models)) if i != first]
+    for i in order:
+        try:
+            response = models[i].generate_content(prompt_text)
+            # Remember the model that answered so later calls don't re-probe dead ones
+            if i != first:
+                with pref["lock"]: pref["index"] = i
+            return response.text
+        except Exception:
+            continue
+    
+    # If we get here, all models failed
+    raise Exception("All Gemini models failed to respond.")
 
 import json
 import os
@@ -360,28 +246,23 @@ with st.expander("📝 AI Coach Settings & Context", expanded=False):
             save_context()
             st.rerun()
 
-# CSS for Coach Card & ensuring textarea text is visible
-st.markdown("""<style>
-.coach-card { border: 1px solid #7c4dff; background: linear-gradient(135deg, #0f0c29 0%, #302b63 100%); border-left: 5px solid #b388ff; padding: 15px; border-radius: 12px; margin-top: 5px; margin-bottom: 20px; color: #e0e0e0; font-size: 0.95rem; } 
-.coach-header { font-size: 1.0rem; font-weight: 600; color: #b388ff; margin-bottom: 5px; display: flex; align-items: center; gap: 5px; }
-</style>""", unsafe_allow_html=True)
-
 # Additional Context for AI: Strength & Weekly Progress
 today = datetime.date.today()
 current_iso_week = today.isocalendar()[1]
 current_year = today.year
 
 # Count strength sessions this week (ISO week starts Monday)
-strength_this_week = len(df[
-    (df['NormalizedType'].str.contains('strength', na=False)) & 
+strength_this_week = int((
+    df['is_strength'] & 
     (df['Date'].dt.isocalendar().week == current_iso_week) & 
-    (df['Date'].dt.year == current_year)
-])
+    (df['Year'] == current_year)
+).sum())
 days_left_in_week = 7 - today.isocalendar()[2] # 1=Mon, 7=Sun
 
 project_goals = "PROJECT 2026 GOALS: 2026km Running, 26 Half Marathons, 104 Strength Sessions, 200+ Active Days."
 user_context_str = f"User: Parva. Physiology: RHR 45, MaxHR 197. User Input: {st.session_state.get('coach_input', st.session_state.get('coach_default_val', 'None'))}."
-metrics_context_str = f"Current Status: Date {today}. CTL {curr_ctl:.1f}, ATL {curr_atl:.1f}, TSB {curr_tsb:.1f}. Workload Ratio {load_ratio:.2f} ({status_text}). Strength Sessions This Week: {strength_this_week}/2 ({days_left_in_week} days left)."
+# Metrics rounded so the prompt (the coach's cache key) only changes when the numbers meaningfully move
+metrics_context_str = f"Current Status: Date {today}. CTL {curr_ctl:.0f}, ATL {curr_atl:.0f}, TSB {curr_tsb:.0f}. Workload Ratio {load_ratio:.1f} ({status_text}). Strength Sessions This Week: {strength_this_week}/2 ({days_left_in_week} days left)."
 
 prompt = f"""
 Act as an elite endurance coach for Parva. 
@@ -428,57 +309,85 @@ if st.button("Refresh Advice", key="btn_refresh_advice"):
     st.rerun()
 
 # --- 2. Charts (Split View) ---
+# Chart ranges, 1Y first. Only the selected range is built on each rerun.
+RANGE_OPTIONS = {
+    "1Y": dict(days_lookback=365),
+    "YTD": dict(is_ytd=True),
+    "6M": dict(days_lookback=180),
+    "3M": dict(days_lookback=90),
+    "30D": dict(days_lookback=30),
+    "7D": dict(days_lookback=7),
+}
+
 col_train_L, col_train_R = st.columns([2, 1])
 
 # --- Training Left: PMC Chart ---
 with col_train_L:
     st.markdown("<div style='font-size: 1rem; font-weight: 600; margin-bottom: 5px;'>Fitness, Fatigue and Form Chart</div>", unsafe_allow_html=True)
-    # Reordered Tabs: 1Y First
-    s1, s2, s3, s4, s5, s6 = st.tabs(["1Y", "YTD", "6M", "3M", "30D", "7D"])
-    
-    def plot_pmc(days_lookback=None, is_ytd=False):
-        end_date = datetime.datetime.now()
+    @st.cache_data(ttl=600, max_entries=16, hash_funcs=FRAME_HASH_FUNCS)
+    def build_pmc_figure(df_phys, days_lookback=None, is_ytd=False):
+        """PMC figure for one range, or None if empty. df_phys ends today, so its fingerprint also keys the day."""
+        if df_phys.empty: return None
+        end_date = df_phys['Date'].max()
         if is_ytd:
-            start_date = datetime.datetime(end_date.year, 1, 1)
+            mask = df_phys['Date'] >= pd.Timestamp(end_date.year, 1, 1)
         else:
-            start_date = end_date - datetime.timedelta(days=days_lookback)
-            
-        mask = (df_phys['Date'] >= start_date) & (df_phys['Date'] <= end_date)
-        df_plot = df_phys.loc[mask].copy()
+            mask = df_phys['Date'] > end_date - pd.Timedelta(days=days_lookback)
+        df_plot = df_phys.loc[mask, ['Date', 'TSB', 'CTL', 'ATL']]
         
         if df_plot.empty:
-            st.info("No data.")
-            return
+            return None
 
+        # One point per day (a few hundred at most), so plain WebGL traces need no downsampling
+        dates = df_plot['Date'].to_numpy()
         fig_pmc = go.Figure()
         # Form
-        fig_pmc.add_trace(go.Scatter(x=df_plot['Date'], y=df_plot['TSB'], name='Form', fill='tozeroy', line=dict(color='rgba(255, 255, 0, 0.5)', width=0), fillcolor='rgba(255, 255, 0, 0.2)'))
+        fig_pmc.add_trace(go.Scattergl(name='Form', x=dates, y=df_plot['TSB'].to_numpy(), fill='tozeroy', line=dict(color='rgba(255, 255, 0, 0.5)', width=0), fillcolor='rgba(255, 255, 0, 0.2)'))
         # Fitness
-        fig_pmc.add_trace(go.Scatter(x=df_plot['Date'], y=df_plot['CTL'], name='Fitness', line=dict(color='#00C805', width=2)))
+        fig_pmc.add_trace(go.Scattergl(name='Fitness', x=dates, y=df_plot['CTL'].to_numpy(), line=dict(color='#00C805', width=2)))
         # Fatigue
-        fig_pmc.add_trace(go.Scatter(x=df_plot['Date'], y=df_plot['ATL'], name='Fatigue', line=dict(color='#FF0080', width=2)))
+        fig_pmc.add_trace(go.Scattergl(name='Fatigue', x=dates, y=df_plot['ATL'].to_numpy(), line=dict(color='#FF0080', width=2)))
         
-        fig_pmc.update_layout(template="plotly_dark", paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)", margin=dict(l=0, r=0, t=30, b=0), height=220, showlegend=True, legend=dict(orientation="h", x=0, y=1.1, bgcolor="rgba(0,0,0,0)"))
-        st.plotly_chart(fig_pmc, use_container_width=True)
+        # Stable uirevision per range: the frontend keeps zoom/legend state and skips remounts
+        fig_pmc.update_layout(template="plotly_dark", paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)", margin=dict(l=0, r=0, t=30, b=0), height=220, showlegend=True, legend=dict(orientation="h", x=0, y=1.1, bgcolor="rgba(0,0,0,0)"), uirevision=f"pmc_{days_lookback}_{is_ytd}")
+        return fig_pmc
+
+    DERIVED_CACHES.append(build_pmc_figure)
+
+    def plot_pmc(days_lookback=None, is_ytd=False):
+        fig_pmc = build_pmc_figure(df_phys, days_lookback, is_ytd)
+        if fig_pmc is None:
+            st.info("No data.")
+            return
+        st.plotly_chart(fig_pmc, use_container_width=True, key=f"pmc_{days_lookback}_{is_ytd}")
 
-    with s1: plot_pmc(days_lookback=365)
-    with s2: plot_pmc(is_ytd=True)
-    with s3: plot_pmc(days_lookback=180)
-    with s4: plot_pmc(days_lookback=90)
-    with s5: plot_pmc(days_lookback=30)
-    with s6: plot_pmc(days_lookback=7)
+    # Fragment: switching the range reruns only this chart, not the whole page
+    @st.fragment
+    def pmc_fragment():
+        # Range selector instead of tabs: tabs build all six hidden figures every rerun
+        pmc_range = st.radio("PMC Range", list(RANGE_OPTIONS), horizontal=True, key="pmc_range", label_visibility="collapsed")
+        plot_pmc(**RANGE_OPTIONS[pmc_range])
+
+    pmc_fragment()
 
 # --- Training Right: Gauge ---
 with col_train_R:
     # 1. Gauge - Compact
-    fig_gauge = go.Figure(go.Indicator(
-        mode = "gauge+number",
-        value = load_ratio,
-        title = {'text': "Workload Ratio", 'font': {'size': 14}},
-        gauge = {'axis': {'range': [0, 2]}, 'bar': {'color': status_color}, 'bgcolor': "rgba(0,0,0,0)", 'steps': [{'range': [0, 0.8], 'color': '#333'}, {'range': [0.8, 1.3], 'color': '#113311'}, {'range': [1.3, 1.5], 'color': '#333311'}, {'range': [1.5, 2.0], 'color': '#331111'}]}
-    ))
-    fig_gauge.update_layout(template="plotly_dark", paper_bgcolor="rgba(0,0,0,0)", margin=dict(l=10, r=10, t=30, b=10), height=160)
-    st.plotly_chart(fig_gauge, use_container_width=True)
+    @st.cache_data(ttl=600, max_entries=16)
+    def build_gauge(load_ratio, status_color):
+        fig_gauge = go.Figure(go.Indicator(
+            mode = "gauge+number",
+            value = load_ratio,
+            title = {'text': "Workload Ratio", 'font': {'size': 14}},
+            gauge = {'axis': {'range': [0, 2]}, 'bar': {'color': status_color}, 'bgcolor': "rgba(0,0,0,0)", 'steps': [{'range': [0, 0.8], 'color': '#333'}, {'range': [0.8, 1.3], 'color': '#113311'}, {'range': [1.3, 1.5], 'color': '#333311'}, {'range': [1.5, 2.0], 'color': '#331111'}]}
+        ))
+        fig_gauge.update_layout(template="plotly_dark", paper_bgcolor="rgba(0,0,0,0)", margin=dict(l=10, r=10, t=30, b=10), height=160, uirevision="gauge")
+        return fig_gauge
+    
+    DERIVED_CACHES.append(build_gauge)
+
+    # Rounded to what the gauge displays so tiny float drift reuses the cached figure
+    st.plotly_chart(build_gauge(round(load_ratio, 2), status_color), use_container_width=True, key="gauge")
     
     # Key Numbers tightly grouped in Flexbox to guarantee side-by-side alignment on vertical phones
     st.markdown(f"""
@@ -501,25 +410,7 @@ with f_col2:
     activity_filter = st.selectbox("Activity", ["All", "Running", "Strength Training", "Walking/Hiking", "Other"], key="act_select")
 
 # --- Filtering Logic ---
-# 1. Base filter by year
-df_year = df[df['Date'].dt.year == selected_year]
-
-# 2. Activity Filter
-if activity_filter == "Running":
-    df_filtered = df_year[df_year['NormalizedType'] == 'running']
-elif activity_filter == "Strength Training":
-    df_filtered = df_year[df_year['NormalizedType'].str.contains('strength', na=False)]
-elif activity_filter == "Walking/Hiking":
-    df_filtered = df_year[df_year['NormalizedType'].str.contains('walking', na=False) | df_year['NormalizedType'].str.contains('hiking', na=False)]
-elif activity_filter == "Other":
-    df_filtered = df_year[
-        (~df_year['NormalizedType'].str.contains('running', na=False)) & 
-        (~df_year['NormalizedType'].str.contains('strength', na=False)) &
-        (~df_year['NormalizedType'].str.contains('walking', na=False)) &
-        (~df_year['NormalizedType'].str.contains('hiking', na=False))
-    ]
-else:
-    df_filtered = df_year
+df_filtered = filter_activities(activity_filter, year=selected_year)
 
 # ==========================================
 # ROW 2: PROGRESS (LEFT) | TRENDS (RIGHT)
@@ -531,11 +422,12 @@ with col_row2_L:
     title_suffix = "Progress" if selected_year == 2026 else "Totals"
     st.subheader(f"Project {selected_year} {title_suffix}")
     
-    df_stats = df[df['Date'].dt.year == selected_year]
-    total_run_km = df_stats[df_stats['NormalizedType'] == 'running']['Distance (km)'].sum()
-    hm_count = len(df_stats[(df_stats['NormalizedType'] == 'running') & (df_stats['Distance (km)'] >= 21.09)])
-    active_days = df_stats['Date'].dt.date.nunique()
-    strength_count = len(df_stats[df_stats['NormalizedType'].str.contains('strength', na=False)])
+    # Per-year totals are computed once per data load; this is a dict lookup
+    totals = load_year_stats().get(selected_year, EMPTY_YEAR_STATS)
+    total_run_km = totals['run_km']
+    hm_count = totals['hm']
+    active_days = totals['active']
+    strength_count = totals['strength']
     
     is_2026 = (selected_year == 2026)
     target_run_km = 2026.0 if is_2026 else None
@@ -560,59 +452,87 @@ with col_row2_L:
 # --- RIGHT: Trends ---
 with col_row2_R:
     st.subheader("Performance Trends")
-    # Reordered Tabs: 1Y First
-    t1, t2, t3, t4, t5, t6 = st.tabs(["1Y", "YTD", "6M", "3M", "30D", "7D"])
-
-    def format_duration_hm(minutes):
-        if minutes < 60: return f"{int(minutes)}m"
-        hours = int(minutes // 60); mins = int(minutes % 60)
-        return f"{hours}h {mins:02d}m"
-
-    def render_summary_chart(days_lookback=None, is_ytd=False):
-        end_date = datetime.datetime.now()
-        start_date = datetime.datetime(end_date.year, 1, 1) if is_ytd else end_date - datetime.timedelta(days=days_lookback)
+    @st.cache_data(ttl=600, max_entries=32, hash_funcs=FRAME_HASH_FUNCS)
+    def daily_totals(df, choice):
+        """Distance/Duration summed per day for one activity filter; every trend window slices this."""
+        df = apply_activity_filter(df, choice)
+        return df.groupby('DateOnly')[['Distance (km)', 'Duration (min)']].sum().rename_axis('Date')
+
+    @st.cache_data(ttl=600, max_entries=64, hash_funcs=FRAME_HASH_FUNCS)
+    def compute_trend(df, activity_filter, days_lookback, is_ytd, today):
+        """
+        Per-period totals for one trend window: (agg, y_col, y_title, total_fmt), or None if empty.
+        df is keyed by its frame signature; today is the day the window ends.
+        """
+        end_date = pd.Timestamp(today)
+        # N-day windows hold the last N days (ending today), like the PMC's Date > end - N
+        start_date = pd.Timestamp(today.year, 1, 1) if is_ytd else end_date - pd.Timedelta(days=days_lookback - 1)
         
-        # Filter Logic based on Global 'activity_filter'
-        if activity_filter == "Running": df_trend = df[df['NormalizedType'] == 'running']
-        elif activity_filter == "Strength Training": df_trend = df[df['NormalizedType'].str.contains('strength', na=False)]
-        elif activity_filter == "Walking/Hiking": df_trend = df[df['NormalizedType'].str.contains('walking', na=False) | df['NormalizedType'].str.contains('hiking', na=False)]
-        elif activity_filter == "Other": df_trend = df[(~df['NormalizedType'].str.contains('running', na=False)) & (~df['NormalizedType'].str.contains('strength', na=False)) & (~df['NormalizedType'].str.contains('walking', na=False)) & (~df['NormalizedType'].str.contains('hiking', na=False))]
-        else: df_trend = df.copy()
-
-        mask = (df_trend['Date'] >= start_date) & (df_trend['Date'] <= end_date)
-        df_trend_final = df_trend.loc[mask].copy()
-
-        if df_trend_final.empty: st.info("No activities."); return
-
-        freq = 'D' if (days_lookback and days_lookback <= 31) else 'W-SUN'
-        df_trend_final['Period'] = df_trend_final['Date'].dt.to_period(freq).apply(lambda r: r.start_time)
-
-        if activity_filter in ["Running", "Walking/Hiking", "All"]:
-            agg = df_trend_final.groupby('Period')['Distance (km)'].sum().reset_index()
-            y_col = 'Distance (km)'; y_title = "Distance"; bar_color = '#00C805'
-            agg['Tooltip'] = agg[y_col].apply(lambda x: f"{x:.1f} km")
-            total_fmt = f"{agg[y_col].sum():.1f} km"
+        # Filter Logic based on the activity filter, applied to the cached per-day totals.
+        # The Date-indexed slice is grouped in place: no reset_index copy, no helper columns.
+        window = daily_totals(df, activity_filter).loc[start_date:end_date]
+
+        if window.empty: return None
+
+        # Weekly bins run Monday-Sunday and are labelled by their Monday, like to_period('W-SUN') starts
+        grouper = pd.Grouper(freq='D') if (days_lookback and days_lookback <= 31) else pd.Grouper(freq='W-MON', label='left', closed='left')
+        by_distance = activity_filter in ["Running", "Walking/Hiking", "All"]
+        src_col = 'Distance (km)' if by_distance else 'Duration (min)'
+        # min_count=1 + dropna keeps only periods with activities, as grouping by period did
+        totals = window.groupby(grouper)[src_col].sum(min_count=1).dropna()
+
+        if by_distance:
+            y_col = 'Distance (km)'; y_title = "Distance"
+            agg = totals.rename(y_col).rename_axis('Period').reset_index()
+            agg['Tooltip'] = np.char.add(totals.to_numpy().round(1).astype(str), ' km')
+            total_fmt = f"{totals.sum():.1f} km"
         else:
-            df_trend_final['Duration (hr)'] = df_trend_final['Duration (min)'] / 60
-            agg = df_trend_final.groupby('Period')['Duration (hr)'].sum().reset_index()
-            y_col = 'Duration (hr)'; y_title = "Hours"; bar_color = '#00C805'
-            agg['Tooltip'] = agg[y_col].apply(lambda x: format_duration_hm(x * 60))
-            total_fmt = format_duration_hm(agg[y_col].sum() * 60)
-
+            # Hours are plotted; labels are formatted from the exact minute totals
+            y_col = 'Duration (hr)'; y_title = "Hours"
+            agg = (totals / 60).rename(y_col).rename_axis('Period').reset_index()
+            agg['Tooltip'] = format_duration_hm_array(totals.to_numpy())
+            total_fmt = format_duration_hm(totals.sum())
+        return agg, y_col, y_title, total_fmt
+
+    @st.cache_resource
+    def trend_figure_template():
+        """Bar + trend-line figure with the shared styling, validated once; every trend window copies it."""
+        bar_color = '#00C805'
         fig = go.Figure()
-        fig.add_trace(go.Bar(x=agg['Period'], y=agg[y_col], name="Vol", marker_color=bar_color, opacity=0.8, customdata=agg['Tooltip'], hovertemplate="%{customdata}<extra></extra>"))
-        fig.add_trace(go.Scatter(x=agg['Period'], y=agg[y_col], name="Trend", mode='lines+markers', line=dict(color='#FFFFFF', width=2), marker=dict(size=4, color='#FFFFFF'), customdata=agg['Tooltip'], hovertemplate="%{customdata}<extra></extra>"))
-        fig.update_layout(template="plotly_dark", paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)", xaxis=dict(showgrid=False, title=""), yaxis=dict(showgrid=False, title=y_title), hovermode="x unified", margin=dict(l=0, r=0, t=10, b=0), height=250, showlegend=False)
+        fig.add_trace(go.Bar(name="Vol", marker_color=bar_color, opacity=0.8, hovertemplate="%{customdata}<extra></extra>"))
+        fig.add_trace(go.Scattergl(name="Trend", mode='lines+markers', line=dict(color='#FFFFFF', width=2), marker=dict(size=4, color='#FFFFFF'), hovertemplate="%{customdata}<extra></extra>"))
+        fig.update_layout(template="plotly_dark", paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)", xaxis=dict(showgrid=False, title=""), yaxis=dict(showgrid=False), hovermode="x unified", margin=dict(l=0, r=0, t=10, b=0), height=250, showlegend=False)
+        return fig
+
+    @st.cache_data(ttl=600, max_entries=64, hash_funcs=FRAME_HASH_FUNCS)
+    def build_summary_figure(df, activity_filter, days_lookback, is_ytd, today):
+        """Trend figure for one window from compute_trend; returns (fig, total_fmt), or (None, None) if empty."""
+        trend = compute_trend(df, activity_filter, days_lookback, is_ytd, today)
+        if trend is None: return None, None
+        agg, y_col, y_title, total_fmt = trend
+
+        # Copy the template and swap in this window's data; only x/y/customdata and the axis title change
+        fig = go.Figure(trend_figure_template())
+        fig.update_traces(x=agg['Period'], y=agg[y_col], customdata=agg['Tooltip'])
         chart_key = f"trend_chart_{days_lookback}_{is_ytd}_{activity_filter}"
-        st.plotly_chart(fig, use_container_width=True, key=chart_key)
+        fig.update_layout(yaxis_title=y_title, uirevision=chart_key)
+        return fig, total_fmt
+
+    DERIVED_CACHES.extend([daily_totals, compute_trend, build_summary_figure])
+
+    def render_summary_chart(days_lookback=None, is_ytd=False):
+        fig, total_fmt = build_summary_figure(df, activity_filter, days_lookback, is_ytd, datetime.date.today())
+        if fig is None: st.info("No activities."); return
+        st.plotly_chart(fig, use_container_width=True, key=f"trend_chart_{days_lookback}_{is_ytd}_{activity_filter}")
         st.caption(f"Total: {total_fmt}")
 
-    with t1: render_summary_chart(days_lookback=365)
-    with t2: render_summary_chart(is_ytd=True)
-    with t3: render_summary_chart(days_lookback=180)
-    with t4: render_summary_chart(days_lookback=90)
-    with t5: render_summary_chart(days_lookback=30)
-    with t6: render_summary_chart(days_lookback=7)
+    # Fragment: switching the range reruns only this chart, not the whole page
+    @st.fragment
+    def trends_fragment():
+        trend_range = st.radio("Trend Range", list(RANGE_OPTIONS), horizontal=True, key="trend_range", label_visibility="collapsed")
+        render_summary_chart(**RANGE_OPTIONS[trend_range])
+
+    trends_fragment()
 
 st.markdown("---")
 
@@ -636,180 +556,121 @@ with col_row3_L:
 # --- RIGHT: Activity Calendar ---
 with col_row3_R:
     st.subheader("Activity Calendar")
-    if 'cal_date' not in st.session_state: st.session_state.cal_date = datetime.date.today()
-    
-    def prev_month(): st.session_state.cal_date = (st.session_state.cal_date.replace(day=1) - datetime.timedelta(days=1))
-    def next_month(): st.session_state.cal_date = (st.session_state.cal_date.replace(day=1) + datetime.timedelta(days=32)).replace(day=1)
-    
-    cc1, cc2, cc3 = st.columns([1, 5, 1])
-    with cc1: st.button("◀", on_click=prev_month, key="cal_prev")
-    with cc2: st.markdown(f"<h3 style='text-align: center; margin: 0;'>{st.session_state.cal_date.strftime('%B %Y')}</h3>", unsafe_allow_html=True)
-    with cc3: st.button("▶", on_click=next_month, key="cal_next")
-    
-    view_year = st.session_state.cal_date.year; view_month = st.session_state.cal_date.month
-    df_cal = df[(df['Date'].dt.year == view_year) & (df['Date'].dt.month == view_month)]
-    
-    # Apply global activity filter to calendar
-    if activity_filter == "Running": df_cal = df_cal[df_cal['NormalizedType'] == 'running']
-    elif activity_filter == "Strength Training": df_cal = df_cal[df_cal['NormalizedType'].str.contains('strength', na=False)]
-    elif activity_filter == "Walking/Hiking": df_cal = df_cal[df_cal['NormalizedType'].str.contains('walking', na=False) | df_cal['NormalizedType'].str.contains('hiking', na=False)]
-    elif activity_filter == "Other": df_cal = df_cal[(~df_cal['NormalizedType'].str.contains('running', na=False)) & (~df_cal['NormalizedType'].str.contains('strength', na=False)) & (~df_cal['NormalizedType'].str.contains('walking', na=False)) & (~df_cal['NormalizedType'].str.contains('hiking', na=False))]
-    
-    active_dates = set(df_cal['Date'].dt.day.tolist())
-    cal_obj = calendar.Calendar(firstweekday=0)
-    month_days = cal_obj.monthdayscalendar(view_year, view_month)
-    
-    # CSS Grid Style (Injected locally for scoping)
-    st.markdown("""
-    <style>
-    .calendar-grid {
-        display: grid;
-        grid-template-columns: repeat(7, 1fr);
-        gap: 4px;
-        margin-top: 10px;
-    }
-    .cal-header {
-        text-align: center;
-        color: #888;
-        font-size: 0.8rem;
-        padding-bottom: 4px;
-    }
-    .cal-cell {
-        text-align: center;
-        padding: 8px;
-        border-radius: 6px;
-        background-color: #1a1a1a;
-        color: #555;
-        font-size: 0.9rem;
-    }
-    .cal-cell.active {
-        background-color: #00C80530;
-        color: #ffffff;
-        border: 1px solid #00C805;
-        font-weight: bold;
-    }
-    .cal-cell.empty {
-        background-color: transparent;
-    }
-    
-    @media (max-width: 640px) {
-        .calendar-grid { gap: 2px; }
-        .cal-cell { padding: 4px; font-size: 0.75rem; min-height: 30px; display: flex; align-items: center; justify-content: center; }
-    }
-    </style>
-    """, unsafe_allow_html=True)
 
-    # HTML Generator
-    html_content = '<div class="calendar-grid">'
-    
-    # Headers
-    for d in ["M", "T", "W", "T", "F", "S", "S"]:
-        html_content += f'<div class="cal-header">{d}</div>'
+    @st.cache_data
+    def calendar_html(year, month, active_bits):
+        """Whole month grid as one HTML string, memoized per (month, active-day bitmask)."""
+        cal_obj = calendar.Calendar(firstweekday=0)
+        # Weeks x 7 grid of day numbers (0 = padding); bit d of active_bits marks day d active
+        month_days = np.array(cal_obj.monthdayscalendar(year, month), dtype=np.int64)
+        active_mask = ((active_bits >> month_days) & 1).astype(bool) & (month_days > 0)
+        
+        # HTML Generator
+        cells = [f'<div class="cal-header">{d}</div>' for d in ["M", "T", "W", "T", "F", "S", "S"]]
         
-    # Days
-    for week in month_days:
-        for day in week:
+        # Days
+        for day, is_active in zip(month_days.ravel().tolist(), active_mask.ravel().tolist()):
             if day == 0:
-                html_content += '<div class="cal-cell empty"></div>'
+                cells.append('<div class="cal-cell empty"></div>')
+            elif is_active:
+                # Fire icon only on active days; CSS handles wrapping on mobile
+                cells.append(f'<div class="cal-cell active">{day} 🔥</div>')
             else:
-                is_active = day in active_dates
-                css_class = "cal-cell active" if is_active else "cal-cell"
-                # Add fire icon only if active
-                content = f"{day}{' 🔥' if is_active else ''}"
-                # On mobile, the fire icon might force stacking if not careful. 
-                # Let's keep it simply "Day" and maybe a color dot? 
-                # Preserving the fire for now but CSS handles wrapping if needed.
-                html_content += f'<div class="{css_class}">{content}</div>'
+                cells.append(f'<div class="cal-cell">{day}</div>')
+        
+        return '<div class="calendar-grid">' + "".join(cells) + '</div>'
     
-    html_content += '</div>'
-    st.markdown(html_content, unsafe_allow_html=True)
+    # Fragment: the month arrows rerun only the calendar, not the whole page
+    @st.fragment
+    def calendar_fragment(activity_filter):
+        if 'cal_date' not in st.session_state: st.session_state.cal_date = datetime.date.today()
 
-st.markdown("---")
+        def prev_month(): st.session_state.cal_date = (st.session_state.cal_date.replace(day=1) - datetime.timedelta(days=1))
+        def next_month(): st.session_state.cal_date = (st.session_state.cal_date.replace(day=1) + datetime.timedelta(days=32)).replace(day=1)
 
-# --- BOTTOM: Activity Feed ---
-st.subheader("Activity Feed")
+        cc1, cc2, cc3 = st.columns([1, 5, 1])
+        with cc1: st.button("◀", on_click=prev_month, key="cal_prev")
+        with cc2: st.markdown(f"<h3 style='text-align: center; margin: 0;'>{st.session_state.cal_date.strftime('%B %Y')}</h3>", unsafe_allow_html=True)
+        with cc3: st.button("▶", on_click=next_month, key="cal_next")
 
-# Sort Controls
-s_col1, s_col2 = st.columns([1, 4])
-with s_col1:
-    sort_option = st.pills("Sort By", ["Date", "Distance", "Duration"], default="Date")
-with s_col2:
-    sort_order = st.pills("Order", ["Descending", "Ascending"], default="Descending", label_visibility="collapsed")
+        view_year = st.session_state.cal_date.year; view_month = st.session_state.cal_date.month
+        # Apply global activity filter to calendar
+        df_cal = filter_activities(activity_filter, year=view_year, month=view_month)
 
-st.caption(f"Showing {len(df_filtered)} activities")
+        # Active days folded into one int: a cheap cache key and a branchless lookup
+        active_bits = int(np.bitwise_or.reduce(np.left_shift(1, df_cal['Day'].to_numpy(dtype=np.int64)), initial=0))
+        html_content = calendar_html(view_year, view_month, active_bits)
+        st.markdown(html_content, unsafe_allow_html=True)
 
-# Sorting Logic
-ascending = True if sort_order == "Ascending" else False
+    calendar_fragment(activity_filter)
 
-if sort_option == "Date":
-    sort_col = "Date"
-elif sort_option == "Distance":
-    sort_col = "Distance (km)"
-elif sort_option == "Duration":
-    sort_col = "Duration (min)"
+st.markdown("---")
 
-df_feed = df_filtered.sort_values(sort_col, ascending=ascending)
+# --- BOTTOM: Activity Feed ---
+st.subheader("Activity Feed")
 
-for index, row in df_feed.iterrows():
-    # Parse Data
-    act_date = row['Date'].strftime('%b %d, %Y')
-    act_type = row['Type'].replace('_', ' ').title()
-    norm_type = row['NormalizedType']
-    
-    # Stats Logic
-    main_stat = ""
-    sub_stat = ""
-    
-    if 'running' in norm_type:
-        dist = row['Distance (km)']
-        dur = row['Duration (min)']
-        hr = row['Avg HR']
-        
-        # Pace (min/km)
-        pace = dur / dist if dist > 0 else 0
-        pace_fmt = format_duration_ms(pace)
-        
-        trimp = row.get('TRIMP', 0)
-        temp = row.get('Max Temp', 0)
-        temp_str = f" • {temp} °C" if temp else ""
-        trimp_str = f" • TRIMP: {int(trimp)}" if trimp else ""
-        
-        main_stat = f"{dist} km"
-        sub_stat = f"{pace_fmt} /km • {int(hr)} bpm{trimp_str}{temp_str}"
-        
-    # Strength
-    elif 'strength' in norm_type:
-        dur = row['Duration (min)']
-        hr = row['Avg HR']
-        
-        main_stat = format_duration_hm(dur)
-        sub_stat = f"Avg HR: {int(hr)} bpm"
-        
-    # Others (Hiking/Walking/etc)
-    else:
-        dist = row['Distance (km)']
-        dur = row['Duration (min)']
-        
-        if dist > 0:
-            main_stat = f"{dist} km"
-            sub_stat = format_duration_hm(dur)
-        else:
-            main_stat = format_duration_hm(dur)
-            sub_stat = ""
-
-    # Render Card
-    st.markdown(
-        f"""
-        <div class="feed-card">
-            <div>
-                <div class="feed-date">{act_date}</div>
-                <div class="feed-title">{act_type}</div>
-            </div>
-            <div>
-                <div class="feed-stats">{main_stat}</div>
-                <div class="feed-substats">{sub_stat}</div>
-            </div>
-        </div>
-        """,
-        unsafe_allow_html=True
+# Fragment: sort changes and "Load more" rerun only the feed, not the whole page
+@st.fragment
+def feed_fragment(df_filtered):
+    # Sort Controls
+    s_col1, s_col2 = st.columns([1, 4])
+    with s_col1:
+        sort_option = st.pills("Sort By", ["Date", "Distance", "Duration"], default="Date")
+    with s_col2:
+        sort_order = st.pills("Order", ["Descending", "Ascending"], default="Descending", label_visibility="collapsed")
+
+    # Pagination: only the first feed_shown cards are rendered, "Load more" extends it
+    FEED_PAGE_SIZE = 25
+    if 'feed_shown' not in st.session_state: st.session_state.feed_shown = FEED_PAGE_SIZE
+    feed_shown = min(st.session_state.feed_shown, len(df_filtered))
+
+    def load_more_feed(): st.session_state.feed_shown += FEED_PAGE_SIZE
+
+    st.caption(f"Showing {feed_shown} of {len(df_filtered)} activities")
+
+    # Sorting Logic
+    ascending = True if sort_order == "Ascending" else False
+
+    if sort_option == "Date":
+        sort_col = "Date"
+    elif sort_option == "Distance":
+        sort_col = "Distance (km)"
+    elif sort_option == "Duration":
+        sort_col = "Duration (min)"
+
+    # Argsort the single sort column and take only the rows shown, instead of sorting the whole frame
+    order = np.argsort(df_filtered[sort_col].to_numpy(), kind='stable')
+    if not ascending: order = order[::-1]
+    df_feed = df_filtered.iloc[order[:feed_shown]]
+    # Build every card's text column-wise: no per-row Python, one string join at the end
+    dist = df_feed['Distance (km)']
+    dur_hm = format_duration_hm_array(df_feed['Duration (min)'])
+    hr_str = df_feed['Avg HR'].astype(int).astype(str)
+    dist_str = dist.astype(str) + ' km'
+    pace = np.divide(df_feed['Duration (min)'].to_numpy(), dist.to_numpy(), out=np.zeros(len(df_feed)), where=dist.to_numpy() > 0)
+    trimp_str = (' • TRIMP: ' + df_feed['TRIMP'].astype(int).astype(str)).where(df_feed['TRIMP'] != 0, '')
+    temp_str = (' • ' + df_feed['Max Temp'].astype(str) + ' °C').where(df_feed['Max Temp'] != 0, '')
+    run_sub = pd.Series(format_duration_ms(pace), index=df_feed.index) + ' /km • ' + hr_str + ' bpm' + trimp_str + temp_str
+
+    # Stats per category: Running (pace/HR/TRIMP/temp), Strength (duration/HR), others (distance if any, duration)
+    category = df_feed['Category']
+    is_run, is_strength, has_dist = (category == 'running').to_numpy(), (category == 'strength').to_numpy(), (dist > 0).to_numpy()
+    main_stat = np.select([is_run, is_strength, has_dist], [dist_str, dur_hm, dist_str], dur_hm)
+    sub_stat = np.select([is_run, is_strength, has_dist], [run_sub, 'Avg HR: ' + hr_str + ' bpm', dur_hm], '')
+
+    cards = (
+        '<div class="feed-card">'
+        '<div><div class="feed-date">' + df_feed['Date'].dt.strftime('%b %d, %Y') + '</div>'
+        # On a categorical, map formats each distinct type once rather than every row
+        '<div class="feed-title">' + df_feed['Type'].map(lambda t: str(t).replace('_', ' ').title()).astype(str) + '</div></div>'
+        '<div><div class="feed-stats">' + main_stat + '</div><div class="feed-substats">' + sub_stat + '</div></div>'
+        '</div>'
     )
+    # Render all cards in one markdown element instead of one element per activity
+    feed_html = "".join(cards)
+    st.markdown(feed_html, unsafe_allow_html=True)
+
+    if feed_shown < len(df_filtered):
+        st.button("Load more", on_click=load_more_feed, key="feed_load_more")
+
+feed_fragment(df_filtered)
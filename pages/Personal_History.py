@@ -1,40 +1,70 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
+from plotly.colors import qualitative
+from plotly_resampler import FigureResampler
 import datetime
+import os
 import numpy as np
-from utils import load_wellness_data, load_intraday_data, load_data
+from utils import load_wellness_data, load_intraday_data, load_intraday_by_type, load_data, get_css, frame_signature, WELLNESS_CACHE
 
 st.set_page_config(page_title="Personal History | Project 2026", page_icon="🧘", layout="wide")
 
-# --- Grafana Dark Theme with Neon Accents ---
-st.markdown("""
-    <style>
-    h1, h2, h3, h4, h5 { font-family: 'Inter', sans-serif; }
-    .stMetric { background-color: #181b1f; padding: 10px; border-radius: 4px; border-left: 3px solid #73bf69; }
-    .block-container { padding-top: 1rem; padding-bottom: 3rem; }
-    /* Hide Streamlit elements */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    </style>
-""", unsafe_allow_html=True)
+# --- Grafana Dark Theme with Neon Accents (styles/personal_history.css) ---
+st.markdown(get_css("personal_history.css"), unsafe_allow_html=True)
 st.title("🧘 Personal History")
 
 # --- Data Loading ---
+# Figure builders cached on the signatures below; filled in where they are defined further down
+DERIVED_CACHES = []
+
+# Loaders are cached for 10 minutes; Refresh drops them so a fresh sync shows up immediately
+def refresh_data():
+    load_wellness_data.clear()
+    load_intraday_data.clear()
+    load_intraday_by_type.clear()
+    load_data.clear()
+    for cached_fn in DERIVED_CACHES: cached_fn.clear()
+    # Refresh means a full pull: drop the on-disk Wellness copy so older-row edits are picked up
+    try:
+        os.remove(WELLNESS_CACHE)
+    except FileNotFoundError:
+        pass
+
+st.button("🔄 Refresh Data", on_click=refresh_data, key="btn_refresh_data")
+
 df_daily = load_wellness_data()
 df_intra = load_intraday_data()
 df_activ = load_data() # For Activity Timeline
+# Dataset signatures: cached figure builders below key on these instead of hashing frames.
+# Sync rewrites today's rows in place, so each one covers the values, not just rows/last date.
+intra_sig = (len(df_intra), df_intra['Timestamp'].max(), float(df_intra['Value'].sum())) if not df_intra.empty else None
+# The daily table is a few hundred rows: hash its full contents
+daily_sig = (len(df_daily), df_daily['Date'].max(), int(pd.util.hash_pandas_object(df_daily, index=False).sum())) if not df_daily.empty else None
+activ_sig = frame_signature(df_activ) if not df_activ.empty else None
 
 from utils import render_sticky_nav
 render_sticky_nav("Personal_History")
 
 # --- Data Loading ---
 
+# --- Chart Helpers ---
+def show_chart(fig, key):
+    """
+    Render a cached go.Figure. A stable key plus each figure's uirevision lets Plotly.react
+    update the mounted chart in place, keeping zoom/pan, instead of remounting it.
+    """
+    st.plotly_chart(fig, use_container_width=True, key=key)
+
 # --- Row 1: KPI Tiles (Big Number + Delta) ---
 # Calculate Deltas (Today vs Yesterday)
-today = df_daily.iloc[-1]
-yesterday = df_daily.iloc[-2] if len(df_daily) > 1 else today
+def latest_two_days(df):
+    """Last two wellness rows as plain dicts (today, yesterday); KPI lookups are dict gets."""
+    last2 = df.tail(2).to_dict('records')
+    return last2[-1], (last2[-2] if len(last2) > 1 else last2[-1])
+
+# Read straight off the cached frame (two small dicts), so a refreshed row shows up at once
+today, yesterday = latest_two_days(df_daily)
 
 c1, c2, c3, c4, c5, c6 = st.columns(6)
 
@@ -53,43 +83,52 @@ kpi_card(c6, "RHR", f"{today.get('RHR',0):.0f}", f"{today.get('RHR',0)-yesterday
 st.markdown("<br>", unsafe_allow_html=True)
 
 # --- Row 2: 24h Time-Series High Resolution ---
+INTRADAY_MAX_POINTS = 1000
 st.markdown("### 🔍 24-Hour Intraday Telemetry")
 if not df_intra.empty:
     # Filter Last 24h
     latest_ts = df_intra['Timestamp'].max()
     start_24h = latest_ts - datetime.timedelta(hours=24)
-    df_24h = df_intra[df_intra['Timestamp'] >= start_24h]
+
+    def intraday_window(kind, start_ts, end_ts):
+        """One metric's rows in [start_ts, end_ts]: a dict lookup, then a binary-searched slice."""
+        df = load_intraday_by_type().get(kind)
+        if df is None: return pd.DataFrame(columns=['Timestamp', 'Value'])
+        i0 = df['Timestamp'].searchsorted(start_ts, side='left')
+        i1 = df['Timestamp'].searchsorted(end_ts, side='right')
+        return df.iloc[i0:i1]
     
     vis1, vis2 = st.columns([1, 1], gap="large")
     
-    with vis1:
-        # Chart 1: Heart Rate + Stress Overlay
-        df_hr = df_24h[df_24h['Type'] == 'HeartRate']
-        df_stress = df_24h[df_24h['Type'] == 'Stress']
+    @st.cache_data(ttl=3600, max_entries=16, show_spinner=False)
+    def build_hr_stress_fig(start_ts, end_ts, data_sig):
+        """Heart Rate + Stress overlay for one window, already downsampled; plain go.Figure so it caches."""
+        df_hr = intraday_window('HeartRate', start_ts, end_ts)
+        df_stress = intraday_window('Stress', start_ts, end_ts)
         
-        fig_dual = go.Figure()
+        # Resampler caps each minute-level trace at INTRADAY_MAX_POINTS sent to the browser (LTTB);
+        # hf_x drops the UTC tz so it downsamples a datetime64 array instead of Timestamp objects
+        fig_dual = FigureResampler(go.Figure(), default_n_shown_samples=INTRADAY_MAX_POINTS)
         
         # Stress (Area)
         if not df_stress.empty:
-             fig_dual.add_trace(go.Scatter(
-                x=df_stress['Timestamp'], y=df_stress['Value'],
+             fig_dual.add_trace(go.Scattergl(
                 mode='lines', name='Stress Level',
                 fill='tozeroy', line=dict(width=0),
                 marker=dict(color='rgba(255, 165, 0, 0.3)'),
                 yaxis='y2', hoverinfo='x+y'
-             ))
+             ), hf_x=df_stress['Timestamp'].dt.tz_convert(None).to_numpy(), hf_y=df_stress['Value'].to_numpy())
              
         # HR (Line) - Red
         if not df_hr.empty:
-            fig_dual.add_trace(go.Scatter(
-                x=df_hr['Timestamp'], y=df_hr['Value'],
+            fig_dual.add_trace(go.Scattergl(
                 mode='lines', name='Heart Rate',
                 line=dict(color='#FF4560', width=2),
                 hoverinfo='x+y'
-            ))
+            ), hf_x=df_hr['Timestamp'].dt.tz_convert(None).to_numpy(), hf_y=df_hr['Value'].to_numpy())
             
         fig_dual.update_layout(
-            template="plotly_dark", height=380,
+            template="plotly_dark", uirevision="hr_stress", height=380,
             title=dict(text="Heart Rate & Stress Overlay", font=dict(size=18, color="#e0e0e0")),
             xaxis=dict(showgrid=False, title=""),
             yaxis=dict(title="Heart Rate (bpm)", showgrid=True, gridcolor='rgba(128,128,128,0.1)', range=[40, 200]),
@@ -99,32 +138,32 @@ if not df_intra.empty:
             paper_bgcolor='rgba(0,0,0,0)',
             plot_bgcolor='rgba(0,0,0,0)'
         )
-        st.plotly_chart(fig_dual, use_container_width=True)
-        
-    with vis2:
-        # Chart 2: Body Battery & Respiration
-        df_bb = df_24h[df_24h['Type'] == 'BodyBattery']
-        df_br = df_24h[df_24h['Type'] == 'Respiration']
+        # Snapshot of the LTTB-aggregated traces; the raw hf arrays are not cached
+        return go.Figure(fig_dual)
+
+    @st.cache_data(ttl=3600, max_entries=16, show_spinner=False)
+    def build_bb_resp_fig(start_ts, end_ts, data_sig):
+        """Body Battery + Respiration for one window, already downsampled; plain go.Figure so it caches."""
+        df_bb = intraday_window('BodyBattery', start_ts, end_ts)
+        df_br = intraday_window('Respiration', start_ts, end_ts)
         
-        fig_br = go.Figure()
+        fig_br = FigureResampler(go.Figure(), default_n_shown_samples=INTRADAY_MAX_POINTS)
         if not df_bb.empty:
-            fig_br.add_trace(go.Scatter(
-                x=df_bb['Timestamp'], y=df_bb['Value'],
+            fig_br.add_trace(go.Scattergl(
                 name='Body Battery', mode='lines',
                 line=dict(color='#00E396', width=2.5),
                 fill='tozeroy', fillcolor='rgba(0, 227, 150, 0.15)',
                 hoverinfo='x+y'
-            ))
+            ), hf_x=df_bb['Timestamp'].dt.tz_convert(None).to_numpy(), hf_y=df_bb['Value'].to_numpy())
         if not df_br.empty:
-            fig_br.add_trace(go.Scatter(
-                x=df_br['Timestamp'], y=df_br['Value'],
+            fig_br.add_trace(go.Scattergl(
                 name='Respiration (BrPM)', mode='lines',
                 line=dict(color='#008FFB', width=1.5, dash='dot'),
                 yaxis='y2', hoverinfo='x+y'
-            ))
+            ), hf_x=df_br['Timestamp'].dt.tz_convert(None).to_numpy(), hf_y=df_br['Value'].to_numpy())
             
         fig_br.update_layout(
-             template="plotly_dark", height=380,
+             template="plotly_dark", uirevision="bb_resp", height=380,
              title=dict(text="Energy Drain & Recovery (Body Battery)", font=dict(size=18, color="#e0e0e0")),
              xaxis=dict(showgrid=False, title=""),
              yaxis=dict(range=[0, 100], title="Body Battery (%)", showgrid=True, gridcolor='rgba(128,128,128,0.1)'),
@@ -134,144 +173,194 @@ if not df_intra.empty:
              paper_bgcolor='rgba(0,0,0,0)',
              plot_bgcolor='rgba(0,0,0,0)'
         )
-        st.plotly_chart(fig_br, use_container_width=True)
+        return go.Figure(fig_br)
+
+    DERIVED_CACHES.extend([build_hr_stress_fig, build_bb_resp_fig])
+
+    with vis1:
+        # Chart 1: Heart Rate + Stress Overlay
+        show_chart(build_hr_stress_fig(start_24h, latest_ts, intra_sig), key="chart_hr_stress")
+        
+    with vis2:
+        # Chart 2: Body Battery & Respiration
+        show_chart(build_bb_resp_fig(start_24h, latest_ts, intra_sig), key="chart_bb_resp")
 
 # --- Row 3: Heatmaps (Steps & Sleep) ---
 st.markdown("### 🧱 Intensity & Consistency")
 crow1, crow2 = st.columns(2)
 
+@st.cache_data(ttl=3600, max_entries=16, show_spinner=False)
+def build_steps_heatmap(data_sig):
+    """Date x hour step-density heatmap, or None without step samples."""
+    df_steps_i = load_intraday_by_type().get('Steps')
+    if df_steps_i is None or df_steps_i.empty: return None
+    # Day x hour sums in one bincount pass: flat cell index = day_idx * 24 + hour
+    # (Timestamp is tz-aware; dropping the tz first gives datetime64, not an object array)
+    ts = df_steps_i['Timestamp'].dt.tz_convert(None).to_numpy().astype('datetime64[h]')
+    days, day_idx = np.unique(ts.astype('datetime64[D]'), return_inverse=True)
+    hour = ts.astype(np.int64) % 24
+    steps = np.nan_to_num(df_steps_i['Value'].to_numpy(dtype=np.float64))
+    z = np.bincount(day_idx * 24 + hour, weights=steps, minlength=len(days) * 24).reshape(len(days), 24)
+    
+    # Custom Dark-to-Neon Green scale
+    custom_scale = [
+        #[0, 'rgba(0,0,0,0)'], # Transparent for 0?
+        [0, '#0e1117'],       # Dark background color
+        [0.1, '#0e2a17'],
+        [0.5, '#00b34a'],
+        [1, '#00E396']        # Neon Green
+    ]
+    
+    fig_heat = go.Figure(go.Heatmap(
+        z=z, x=np.arange(24), y=np.datetime_as_string(days),
+        colorscale=custom_scale, showscale=False,
+        xgap=2, ygap=2, hoverongaps=False,
+        hovertemplate="Day: %{y}<br>Hour: %{x}:00<br>Steps: %{z:,.0f}<extra></extra>"
+    ))
+    fig_heat.update_layout(
+        title=dict(text="Intraday Step Density", font=dict(size=18, color="#e0e0e0")),
+        template="plotly_dark", uirevision="steps_heatmap", height=380,
+        xaxis=dict(title="Hour of Day", tickmode='linear', tick0=0, dtick=3, showgrid=False),
+        yaxis=dict(title="", autorange="reversed", showgrid=False),
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(t=50, l=10, r=10, b=30)
+    )
+    return fig_heat
+
+@st.cache_data(ttl=3600, max_entries=16, show_spinner=False)
+def build_hypnogram(data_sig):
+    """Sleep Architecture timeline as horizontal bars, or None without sleep-stage samples."""
+    df_sleep_i = load_intraday_by_type().get('SleepStage')
+    if df_sleep_i is None or df_sleep_i.empty: return None
+    # Garmin stage values are the category codes: 0 Unknown, 1 Deep, 2 Light, 3 REM, 4 Awake
+    stage_names = ["Unknown", "Deep", "Light", "REM", "Awake"]
+    color_map = {"Awake": "#FF4560", "REM": "#775DD0", "Light": "#00E396", "Deep": "#008FFB", "Unknown": "gray"}
+    v = df_sleep_i['Value'].to_numpy()
+    codes = np.where((v >= 0) & (v < len(stage_names)), v, -1).astype(np.int8) # NaN/out of range -> missing
+    stage = pd.Categorical.from_codes(codes, categories=stage_names)
+    keep = codes >= 0
+         
+    # Gantt as ONE horizontal bar trace: base = segment start, length = duration in ms on a date
+    # axis, per-bar colors looked up from the stage codes
+    stage_order = ["Awake", "REM", "Light", "Deep", "Unknown"]
+    seg_ms = (df_sleep_i['EndTimestamp'] - df_sleep_i['Timestamp']).dt.total_seconds().to_numpy() * 1000
+    stage_colors = np.array([color_map[n] for n in stage_names])
+    fig_gantt = go.Figure(go.Bar(
+        base=df_sleep_i['Timestamp'].dt.tz_convert(None).to_numpy()[keep], x=seg_ms[keep], y=np.asarray(stage)[keep],
+        orientation='h', marker_color=stage_colors[codes[keep]],
+        hovertemplate="<b>%{y}</b><br>%{base|%H:%M}<extra></extra>"
+    ))
+    fig_gantt.update_yaxes(autorange="reversed", title="", categoryorder="array", categoryarray=stage_order)
+    fig_gantt.update_xaxes(title="Time", type="date")
+    fig_gantt.update_layout(
+        template="plotly_dark", uirevision="hypnogram", height=380, 
+        title=dict(text="Sleep Architecture (Hypnogram)", font=dict(size=18, color="#e0e0e0")),
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(t=50, l=10, r=10, b=30), barmode="overlay", showlegend=False
+    )
+    return fig_gantt
+
+DERIVED_CACHES.extend([build_steps_heatmap, build_hypnogram])
+
 with crow1: # Steps Heatmap
-    if not df_intra.empty:
-        df_steps_i = df_intra[df_intra['Type'] == 'Steps'].copy()
-        if not df_steps_i.empty:
-            df_steps_i['Hour'] = df_steps_i['Timestamp'].dt.hour
-            df_steps_i['DateStr'] = df_steps_i['Timestamp'].dt.date
-            pivot = df_steps_i.pivot_table(index='DateStr', columns='Hour', values='Value', aggfunc='sum').fillna(0)
-            
-            # Custom Dark-to-Neon Green scale
-            custom_scale = [
-                #[0, 'rgba(0,0,0,0)'], # Transparent for 0?
-                [0, '#0e1117'],       # Dark background color
-                [0.1, '#0e2a17'],
-                [0.5, '#00b34a'],
-                [1, '#00E396']        # Neon Green
-            ]
-            
-            fig_heat = go.Figure(go.Heatmap(
-                z=pivot.values, x=pivot.columns, y=pivot.index,
-                colorscale=custom_scale, showscale=False,
-                xgap=2, ygap=2, hoverongaps=False,
-                hovertemplate="Day: %{y}<br>Hour: %{x}:00<br>Steps: %{z:,.0f}<extra></extra>"
-            ))
-            fig_heat.update_layout(
-                title=dict(text="Intraday Step Density", font=dict(size=18, color="#e0e0e0")),
-                template="plotly_dark", height=380,
-                xaxis=dict(title="Hour of Day", tickmode='linear', tick0=0, dtick=3, showgrid=False),
-                yaxis=dict(title="", autorange="reversed", showgrid=False),
-                paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                margin=dict(t=50, l=10, r=10, b=30)
-            )
-            st.plotly_chart(fig_heat, use_container_width=True)
+    fig_heat = build_steps_heatmap(intra_sig) if intra_sig else None
+    if fig_heat is not None:
+        show_chart(fig_heat, key="chart_steps_heatmap")
             
 with crow2: # Sleep Architecture Timeline
-    df_sleep_i = df_intra[df_intra['Type'] == 'SleepStage'].copy() if not df_intra.empty else pd.DataFrame()
-    if not df_sleep_i.empty:
-        stage_map = {1: "Deep", 2: "Light", 3: "REM", 4: "Awake", 0: "Unknown"}
-        color_map = {"Awake": "#FF4560", "REM": "#775DD0", "Light": "#00E396", "Deep": "#008FFB", "Unknown": "gray"}
-        df_sleep_i['Stage'] = df_sleep_i['Value'].map(stage_map)
-        
-        if 'EndTimestamp' not in df_sleep_i.columns: pass # handled by utils
-             
-        fig_gantt = px.timeline(
-            df_sleep_i, x_start="Timestamp", x_end="EndTimestamp", y="Stage",
-            color="Stage", color_discrete_map=color_map,
-            category_orders={"Stage": ["Awake", "REM", "Light", "Deep", "Unknown"]},
-            hover_name="Stage"
-        )
-        fig_gantt.update_yaxes(autorange="reversed", title="")
-        fig_gantt.update_xaxes(title="Time")
-        fig_gantt.update_layout(
-            template="plotly_dark", height=380, 
-            title=dict(text="Sleep Architecture (Hypnogram)", font=dict(size=18, color="#e0e0e0")),
-            paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-            margin=dict(t=50, l=10, r=10, b=30),
-            legend=dict(orientation="h", y=1.08, x=0.5, xanchor="center", title="")
-        )
-        st.plotly_chart(fig_gantt, use_container_width=True)
+    fig_gantt = build_hypnogram(intra_sig) if intra_sig else None
+    if fig_gantt is not None:
+        show_chart(fig_gantt, key="chart_hypnogram")
 
 # --- Row 4: Performance ---
 st.markdown("### 🏃 Performance Trends")
 p1, p2 = st.columns([2, 1], gap="large")
 
-with p1: # Activity timeline
-     if not df_activ.empty:
-         activ_7d = df_activ.sort_values("Date").tail(15)
-         activ_7d['End'] = activ_7d['Date'] + pd.to_timedelta(activ_7d['Duration (min)'], unit='m')
-         
-         fig_act = px.timeline(
-             activ_7d, x_start="Date", x_end="End", y="NormalizedType",
-             color="NormalizedType",
-             height=350, color_discrete_sequence=px.colors.qualitative.Prism,
-             hover_data={"NormalizedType": False, "Date": "|%b %d, %H:%M", "Distance (km)": ':.2f'}
-         )
-         fig_act.update_layout(
-             title=dict(text="Recent Activities Timeline", font=dict(size=18, color="#e0e0e0")),
-             template="plotly_dark", showlegend=False,
-             yaxis=dict(title="", categoryorder="category descending"), xaxis=dict(title="Date & Time"),
-             paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-             margin=dict(t=50, l=10, r=10, b=10)
-         )
-         st.plotly_chart(fig_act, use_container_width=True)
+@st.cache_data(ttl=3600, max_entries=16, show_spinner=False)
+def build_activity_timeline(data_sig):
+    """Last 15 activities as a Gantt in ONE horizontal bar trace, colored per activity type."""
+    # load_data returns activities sorted by Date, with End precomputed
+    activ_7d = load_data().tail(15)[['Date', 'End', 'NormalizedType', 'Distance (km)']]
+    
+    act_ms = (activ_7d['End'] - activ_7d['Date']).dt.total_seconds().to_numpy() * 1000
+    act_types = activ_7d['NormalizedType'].astype(str).to_numpy()
+    # Type codes in order of first appearance pick the Prism color, as one trace per type did
+    type_codes, _ = pd.factorize(act_types)
+    palette = np.array(qualitative.Prism)
+    fig_act = go.Figure(go.Bar(
+        base=activ_7d['Date'].to_numpy(), x=act_ms, y=act_types,
+        orientation='h', marker_color=palette[type_codes % len(palette)],
+        customdata=activ_7d['Distance (km)'].to_numpy(),
+        hovertemplate="Date=%{base|%b %d, %H:%M}<br>Distance (km)=%{customdata:.2f}<extra></extra>"
+    ))
+    fig_act.update_xaxes(type="date")
+    fig_act.update_layout(
+        title=dict(text="Recent Activities Timeline", font=dict(size=18, color="#e0e0e0")),
+        template="plotly_dark", uirevision="activity_timeline", showlegend=False, height=350, barmode="overlay",
+        yaxis=dict(title="", categoryorder="category descending"), xaxis=dict(title="Date & Time"),
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(t=50, l=10, r=10, b=10)
+    )
+    return fig_act
 
-with p2: # Daily Steps Trend
-    fig_tr = px.bar(df_daily.tail(30), x='Date', y='Steps')
-    fig_tr.update_traces(
+@st.cache_data(ttl=3600, max_entries=16, show_spinner=False)
+def build_steps_trend(data_sig):
+    """Daily step totals for the last 30 wellness rows."""
+    df_steps_30 = load_wellness_data().tail(30)
+    fig_tr = go.Figure(go.Bar(
+        x=df_steps_30['Date'].to_numpy(), y=df_steps_30['Steps'].to_numpy(),
         marker_color='#00E396', marker_line_width=0, opacity=0.8,
         hovertemplate="Date: %{x}<br>Steps: %{y:,.0f}<extra></extra>"
-    )
+    ))
     fig_tr.update_layout(
         title=dict(text="30-Day Step Trend", font=dict(size=18, color="#e0e0e0")),
-        template="plotly_dark", height=350, coloraxis_showscale=False,
+        template="plotly_dark", uirevision="steps_trend", height=350, coloraxis_showscale=False,
         yaxis=dict(title="Total Steps", showgrid=True, gridcolor='rgba(128,128,128,0.1)'),
         xaxis=dict(title=""),
         paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
         margin=dict(t=50, l=10, r=10, b=10)
     )
-    st.plotly_chart(fig_tr, use_container_width=True)
+    return fig_tr
+
+DERIVED_CACHES.extend([build_activity_timeline, build_steps_trend])
+
+with p1: # Activity timeline
+    if activ_sig:
+        show_chart(build_activity_timeline(activ_sig), key="chart_activity_timeline")
+
+with p2: # Daily Steps Trend
+    show_chart(build_steps_trend(daily_sig), key="chart_steps_trend")
 
 # --- Row 5: Long-Term Stats ---
 st.markdown("### ⚖️ Long Term Stats")
 l1, l2 = st.columns(2, gap="large")
 
-with l1:
-    fig_vo2 = px.line(df_daily, x='Date', y='VO2Max', markers=True)
-    fig_vo2.update_traces(
-        line_color="#775DD0", marker=dict(size=6, color="#775DD0", line=dict(width=2, color="#0b0c0e")),
-        hovertemplate="Date: %{x}<br>VO2 Max: %{y:.1f}<extra></extra>"
-    )
-    fig_vo2.update_layout(
-        title=dict(text="VO2 Max Trend", font=dict(size=18, color="#e0e0e0")),
-        template="plotly_dark", height=320,
-        yaxis=dict(title="VO2 Max", showgrid=True, gridcolor='rgba(128,128,128,0.1)'),
+@st.cache_data(ttl=3600, max_entries=16, show_spinner=False)
+def build_daily_trend(data_sig, col, color, title, y_title, hover_fmt):
+    """Lines+markers trend of one wellness column over every recorded day (VO2 Max, HRV)."""
+    df_daily = load_wellness_data()
+    fig = go.Figure(go.Scattergl(
+        x=df_daily['Date'].to_numpy(), y=df_daily[col].to_numpy(), mode='lines+markers',
+        line_color=color, marker=dict(size=6, color=color, line=dict(width=2, color="#0b0c0e")),
+        hovertemplate=f"Date: %{{x}}<br>{hover_fmt}<extra></extra>"
+    ))
+    fig.update_layout(
+        title=dict(text=title, font=dict(size=18, color="#e0e0e0")),
+        template="plotly_dark", uirevision=col, height=320,
+        yaxis=dict(title=y_title, showgrid=True, gridcolor='rgba(128,128,128,0.1)'),
         xaxis=dict(title=""),
         paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
         margin=dict(t=50, l=10, r=10, b=10)
     )
-    st.plotly_chart(fig_vo2, use_container_width=True)
+    return fig
+
+DERIVED_CACHES.append(build_daily_trend)
+
+with l1:
+    fig_vo2 = build_daily_trend(daily_sig, 'VO2Max', "#775DD0", "VO2 Max Trend", "VO2 Max", "VO2 Max: %{y:.1f}")
+    show_chart(fig_vo2, key="chart_vo2")
 
 with l2:
     if 'HRV_ms' in df_daily.columns:
-        fig_hrv = px.line(df_daily, x='Date', y='HRV_ms', markers=True)
-        fig_hrv.update_traces(
-            line_color="#008FFB", marker=dict(size=6, color="#008FFB", line=dict(width=2, color="#0b0c0e")),
-            hovertemplate="Date: %{x}<br>HRV: %{y:.0f} ms<extra></extra>"
-        )
-        fig_hrv.update_layout(
-            title=dict(text="HRV Status (ms)", font=dict(size=18, color="#e0e0e0")),
-            template="plotly_dark", height=320,
-            yaxis=dict(title="Average HRV (ms)", showgrid=True, gridcolor='rgba(128,128,128,0.1)'),
-            xaxis=dict(title=""),
-            paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-            margin=dict(t=50, l=10, r=10, b=10)
-        )
-        st.plotly_chart(fig_hrv, use_container_width=True)
+        fig_hrv = build_daily_trend(daily_sig, 'HRV_ms', "#008FFB", "HRV Status (ms)", "Average HRV (ms)", "HRV: %{y:.0f} ms")
+        show_chart(fig_hrv, key="chart_hrv")
@@ -1,59 +1,13 @@
 import streamlit as st
 import pandas as pd
 import json
-from utils import load_data, calculate_physiology, save_training_plan, load_training_plan
+from utils import load_data, calculate_physiology, save_training_plan, load_training_plan, get_css
 from training_engine import generate_training_plan
 
 st.set_page_config(page_title="Elite Training Engine | Project 2026", page_icon="🧬", layout="wide")
 
-# --- Grafana Dark Theme with Neon Accents ---
-st.markdown("""
-    <style>
-    h1, h2, h3, h4, h5 { font-family: 'Inter', sans-serif; }
-    .stMetric { background-color: #181b1f; padding: 10px; border-radius: 4px; border-left: 3px solid #73bf69; }
-    .block-container { padding-top: 1rem; padding-bottom: 3rem; }
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    
-    .vibe-box {
-        background-color: #181b1f;
-        border-left: 4px solid #775DD0;
-        padding: 20px;
-        border-radius: 8px;
-        margin-bottom: 30px;
-    }
-    
-    .day-card {
-        background-color: #181b1f;
-        border: 1px solid #333;
-        border-radius: 6px;
-        padding: 10px;
-        min-height: 120px;
-        display: flex;
-        flex-direction: column;
-    }
-    
-    .day-title { font-weight: bold; font-size: 0.9em; margin-bottom: 5px; color: #888; }
-    .day-type { font-weight: bold; font-size: 1.1em; margin-bottom: 5px; }
-    .day-dist { color: #00E396; font-size: 0.9em; margin-bottom: 5px; }
-    .day-desc { font-size: 0.8em; color: #ccc; flex-grow: 1; }
-    
-    .type-rest { color: #888; }
-    .type-easy { color: #00E396; }
-    .type-interval { color: #FF4560; }
-    .type-long { color: #775DD0; }
-    .type-tempo { color: #f2cc0c; }
-    </style>
-""", unsafe_allow_html=True)
-
-# Custom Nav
-st.markdown("""
-<style>
-div[data-testid="stColumn"] > div > div > div > div { gap: 0.5rem; }
-.nav-btn { width: 100%; border: 1px solid #333; background: #181b1f; color: white; padding: 10px; text-align: center; border-radius: 5px; cursor: pointer; text-decoration: none; display: block; }
-.nav-btn:hover { background: #22252b; border-color: #73bf69; }
-</style>
-""", unsafe_allow_html=True)
+# --- Grafana Dark Theme with Neon Accents, plus Custom Nav (styles/training_plan.css) ---
+st.markdown(get_css("training_plan.css"), unsafe_allow_html=True)
 from utils import render_sticky_nav
 render_sticky_nav("Training_Plan")
 
@@ -1,5 +1,6 @@
 
 import os
+import json
 import logging
 import datetime
 import pandas as pd
@@ -13,6 +14,7 @@ from garminconnect import (
 )
 from dotenv import load_dotenv
 import pytz
+import time
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -28,6 +30,9 @@ load_dotenv(os.path.join(script_dir, '.env'))
 GARMIN_EMAIL = os.getenv("GARMIN_EMAIL")
 GARMIN_PASSWORD = os.getenv("GARMIN_PASSWORD")
 
+# Garmin OAuth token cache (garth dump); reused across runs so sync skips the SSO login
+GARMIN_TOKEN_DIR = os.getenv("GARMIN_TOKEN_DIR", "/tmp/garmintokens")
+
 # Google Sheets Credentials
 SERVICE_ACCOUNT_FILE = os.path.join(script_dir, 'service_account.json')
 GOOGLE_SHEET_KEY = os.getenv("GOOGLE_SHEET_KEY")
@@ -71,9 +76,11 @@ def save_garmin_tokens_to_sheet(spreadsheet, token_dir):
 
 def init_garmin(spreadsheet=None):
     """Initialize Garmin Connect API."""
-    token_dir = "/tmp/garmintokens"
+    token_dir = GARMIN_TOKEN_DIR
     try:
-        if spreadsheet:
+        # Local tokens from an earlier run win; the Metadata sheet copy is only read when none exist
+        has_local_tokens = any(pathlib.Path(token_dir).glob("*.json"))
+        if spreadsheet and not has_local_tokens:
             token_str = load_garmin_tokens_from_sheet(spreadsheet)
             if token_str:
                 token_data = json.loads(token_str)
@@ -136,35 +143,33 @@ def get_activities(garmin_client, start_date="2025-01-01"):
         return []
 
 def process_activities(activities):
-    """Process raw Garmin activities into a clean list of dicts."""
-    data = []
-    for activity in activities:
-        # Extract relevant fields
-        activity_type = activity.get("activityType", {}).get("typeKey", "unknown")
-        
-        # Calculate consistent pace (min/km) from speed (m/s) if applicable
-        # Speed is m/s. 1 m/s = 3.6 km/h. Pace = 60 / (speed * 3.6)
-        dist_val = activity.get("distance") or 0
-        dur_val = activity.get("duration") or 0
-        avg_speed = activity.get("averageSpeed") or 0
-        
-        row = {
-            "Activity ID": activity.get("activityId"),
-            "Date": activity.get("startTimeLocal"),
-            "Type": activity_type,
-            "Distance (km)": round(dist_val / 1000, 2),
-            "Duration (min)": round(dur_val / 60, 2),
-            "Avg HR": activity.get("averageHR") or 0,
-            "Max HR": activity.get("maxHR") or 0,
-            "Elevation Gain (m)": activity.get("totalElevationGain", 0),
-            "Avg Speed (m/s)": avg_speed,
-            "Coordinates": f"{activity.get('startLatitude')},{activity.get('startLongitude')}" if activity.get('startLatitude') else None,
-            "VO2Max": activity.get("vO2MaxValue", 0),
-            "Max Temp": activity.get("maxTemperature", 0),
-            "Min Temp": activity.get("minTemperature", 0)
-        }
-        data.append(row)
-    return data
+    """Process raw Garmin activities into a DataFrame with the sheet's columns, in sheet order."""
+    raw = pd.json_normalize(activities)
+
+    def field(key, default=0):
+        # Missing keys/None become the default, like activity.get(key) or default did per row
+        return raw[key].fillna(default) if key in raw.columns else pd.Series(default, index=raw.index)
+
+    lat, lon = field("startLatitude"), field("startLongitude")
+    coords = lat.astype(str) + "," + lon.astype(str)
+
+    df = pd.DataFrame({
+        "Activity ID": raw["activityId"].astype("Int64") if "activityId" in raw.columns else pd.NA,
+        "Date": raw.get("startTimeLocal"),
+        "Type": field("activityType.typeKey", "unknown"),
+        # Calculate consistent units from Garmin's metres/seconds
+        "Distance (km)": (field("distance") / 1000).round(2),
+        "Duration (min)": (field("duration") / 60).round(2),
+        "Avg HR": field("averageHR"),
+        "Max HR": field("maxHR"),
+        "Elevation Gain (m)": field("totalElevationGain"),
+        "Avg Speed (m/s)": field("averageSpeed"),
+        "Coordinates": coords.where(lat != 0, None),
+        "VO2Max": field("vO2MaxValue"),
+        "Max Temp": field("maxTemperature"),
+        "Min Temp": field("minTemperature"),
+    }, index=raw.index)
+    return df
 
 def sync():
     # We must init gspread first to pass spreadsheet to garmin for token loading
@@ -178,13 +183,22 @@ def sync():
     
     # Fetch existing IDs to avoid duplicates and figure out the last extracted date
     try:
-        existing_data = sheet.get_all_records()
-        logging.info(f"DEBUG: Found {len(existing_data)} rows in Google Sheets.")
-        existing_ids = set(str(row.get("Activity ID")) for row in existing_data)
+        # Only the two columns dedup needs, in one request (no per-row dicts for the whole sheet)
+        header = sheet.row_values(1)
+        id_col, date_col = (
+            gspread.utils.rowcol_to_a1(1, header.index(c) + 1).rstrip('0123456789') if c in header else None
+            for c in ("Activity ID", "Date")
+        )
+        ranges = [f"{l}2:{l}" for l in (id_col, date_col) if l]
+        cols = [r[0] if r else [] for r in sheet.batch_get(ranges, major_dimension='COLUMNS')] if ranges else []
+        id_values = cols[0] if id_col else []
+        date_values = cols[-1] if date_col else []
+        logging.info(f"DEBUG: Found {len(id_values)} rows in Google Sheets.")
+        existing_ids = set(str(v) for v in id_values)
         
         existing_dates = []
-        for row in existing_data:
-            d_str = str(row.get("Date", ""))
+        for d_str in date_values:
+            d_str = str(d_str)
             if " " in d_str: d_str = d_str.split(" ")[0]
             if "T" in d_str: d_str = d_str.split("T")[0]
             if len(d_str) >= 10: existing_dates.append(d_str[:10])
@@ -208,24 +222,16 @@ def sync():
         logging.info("No activities found.")
         return
 
-    processed_data = process_activities(activities)
-    
-    new_rows = []
-    for record in processed_data:
-        if str(record["Activity ID"]) not in existing_ids:
-            # Prepare row list in order of headers if they exist, or just keys
-            # Better to rely on a fixed structure
-            # If sheet is empty, write headers
-            if not existing_ids and not new_rows:
-                # We need to set headers first if empty
-                 headers = list(record.keys())
-                 sheet.append_row(headers)
-            
-            new_rows.append(list(record.values()))
+    processed = process_activities(activities)
+    new_df = processed[~processed["Activity ID"].astype(str).isin(existing_ids)]
+    # Plain Python values for the Sheets JSON payload: NaN/NA become empty cells
+    new_rows = new_df.astype(object).where(new_df.notna(), None).values.tolist()
 
     if new_rows:
+        # An empty sheet gets its header row in the same append: one round-trip either way
+        payload = new_rows if existing_ids else [list(processed.columns)] + new_rows
         # Provide value_input_option to parse dates/numbers correctly if needed
-        sheet.append_rows(new_rows, value_input_option="USER_ENTERED")
+        sheet.append_rows(payload, value_input_option="USER_ENTERED")
         logging.info(f"Synced {len(new_rows)} new activities.")
     else:
         logging.info("No new activities to sync.")
@@ -237,6 +243,94 @@ def sync():
     # 3. Intraday Wellness Sync
     sync_wellness_intraday(garmin_client, sheet.spreadsheet)
 
+# Wellness backfill runs one day at a time: every call goes through the single garth
+# session, which is not safe to share across threads. The pause keeps under Garmin's rate limit.
+WELLNESS_DAY_INTERVAL = 2 # seconds between days
+
+def fetch_wellness_day(garmin_client, date_str):
+    """Fetch and parse one day's wellness row (Date, Steps, RHR, Stress, BB max/min, Sleep, HRV, VO2, Active kcal)."""
+    # Fetch various stats
+    # 1. User Summary (Steps, RHR, Stress, VO2Max)
+    # Garmin API often returns list for date, but sometimes just dict. 
+    # We assume garminconnect returns stats for the day.
+    # Using specific methods if available or generic fetch.
+    
+    # steps/hr/stress comes from 'user summary' usually
+    summary = garmin_client.get_user_summary(date_str)
+    
+    # body battery
+    bb_data = garmin_client.get_body_battery(date_str)
+    
+    # sleep (previous night)
+    sleep_data = garmin_client.get_sleep_data(date_str)
+    
+    # hrv (previous night)
+    hrv_data = garmin_client.get_hrv_data(date_str)
+    
+    # Parse
+    # Summary fields
+    steps = summary.get("totalSteps") or 0
+    active_cal = summary.get("activeKilocalories") or 0
+    rhr = summary.get("restingHeartRate") or 0
+    stress = summary.get("averageStressLevel") or 0
+    vo2 = summary.get("vo2MaxValue") or 0
+    
+    # Fallback: Training Status
+    if vo2 == 0:
+        try:
+             logging.info(f"VO2 0 in summary, trying Training Status for {date_str}")
+             train_status = garmin_client.get_training_status(date_str)
+             # usually returns dict with 'vo2Max'
+             if train_status and isinstance(train_status, dict):
+                 vo2 = train_status.get('vo2Max') or 0
+        except Exception as e:
+             logging.warning(f"Training status failed: {e}")
+    
+    # Body Battery
+    bb_max = 0
+    bb_min = 0
+    if bb_data:
+        # Based on garminconnect returning a list of dicts per day
+        if isinstance(bb_data, list) and len(bb_data) > 0:
+           first_item = bb_data[0]
+           if "bodyBatteryValuesArray" in first_item:
+               # This is the array of [timestamp, level] or similar
+               vals = [x[1] for x in first_item["bodyBatteryValuesArray"] if len(x) >= 2 and x[1] is not None]
+               if vals:
+                   bb_max = max(vals)
+                   bb_min = min(vals)
+           elif "value" in first_item:
+               vals = [x['value'] for x in bb_data if 'value' in x and x['value'] is not None]
+               if vals:
+                   bb_max = max(vals)
+                   bb_min = min(vals)
+
+    # Sleep
+    sleep_score = sleep_data.get("dailySleepDTO", {}).get("sleepScores", {}).get("overall", {}).get("value") or 0
+    sleep_sec = sleep_data.get("dailySleepDTO", {}).get("sleepTimeSeconds") or 0
+    sleep_hours = round(sleep_sec / 3600, 2)
+    
+    # HRV
+    hrv_ms = hrv_data.get("hrvSummary", {}).get("weeklyAverage") or 0 # Fallback
+    # Try to get nightly avg
+    if hrv_data.get("hrvSummary", {}).get("lastNightAvg"):
+        hrv_ms = hrv_data.get("hrvSummary", {}).get("lastNightAvg") or 0
+
+    new_row = [
+        date_str,
+        steps,
+        rhr,
+        stress,
+        bb_max,
+        bb_min,
+        sleep_score,
+        sleep_hours,
+        hrv_ms,
+        vo2,
+        active_cal
+    ]
+    return new_row
+
 def get_wellness_data(garmin_client, sheet_conn):
     """Fetch daily wellness metrics (Steps, Sleep, Stress, BB, HRV)."""
     # 1. Determine start date
@@ -247,17 +341,17 @@ def get_wellness_data(garmin_client, sheet_conn):
         wellness_sheet.append_row(["Date", "Steps", "RHR", "Stress_Avg", "BodyBattery_Max", "BodyBattery_Min", "Sleep_Score", "Sleep_Hours", "HRV_ms", "VO2Max"])
 
     try:
-        existing_data = wellness_sheet.get_all_records()
-        existing_dates = set(row.get("Date") for row in existing_data)
+        # Date is column A: fetch just that column, and map each date to its sheet row once
+        date_values = wellness_sheet.col_values(1)[1:]
+        date_rows = {str(d)[:10]: i + 2 for i, d in enumerate(date_values) if d}
+        existing_dates = set(date_rows)
         # Find last date. We do NOT add 1 day so we overwrite the last recorded day (usually today) with intraday updates.
-        if existing_dates:
-            last_date_str = max(existing_dates)
-            start_date = datetime.datetime.strptime(last_date_str, "%Y-%m-%d").date()
-        else:
-            start_date = datetime.date(2025, 1, 1)
+        # One vectorized parse; malformed cells become NaT instead of aborting the max
+        last_date = pd.to_datetime(pd.Series(list(date_rows), dtype=object), format="%Y-%m-%d", errors="coerce").max()
+        start_date = last_date.date() if pd.notna(last_date) else datetime.date(2025, 1, 1)
     except Exception:
         existing_dates = set()
-        existing_data = [] # ensure empty list instead of fail
+        date_rows = {} # ensure empty mapping instead of fail
         start_date = datetime.date(2025, 1, 1)
 
     today = datetime.date.today()
@@ -266,110 +360,31 @@ def get_wellness_data(garmin_client, sheet_conn):
 
     logging.info(f"Syncing Wellness data from {start_date} to {today}...")
     
-    wellness_rows = []
-    current_date = start_date
-    
-    while current_date <= today:
-        date_str = current_date.isoformat()
+    dates = [start_date + datetime.timedelta(days=i) for i in range((today - start_date).days + 1)]
+    results = []
+    for day in dates:
+        date_str = day.isoformat()
         try:
-            # Fetch various stats
-            # 1. User Summary (Steps, RHR, Stress, VO2Max)
-            # Garmin API often returns list for date, but sometimes just dict. 
-            # We assume garminconnect returns stats for the day.
-            # Using specific methods if available or generic fetch.
-            
-            # steps/hr/stress comes from 'user summary' usually
-            summary = garmin_client.get_user_summary(date_str)
-            
-            # body battery
-            bb_data = garmin_client.get_body_battery(date_str)
-            
-            # sleep (previous night)
-            sleep_data = garmin_client.get_sleep_data(date_str)
-            
-            # hrv (previous night)
-            hrv_data = garmin_client.get_hrv_data(date_str)
-            
-            # Parse
-            # Summary fields
-            steps = summary.get("totalSteps") or 0
-            active_cal = summary.get("activeKilocalories") or 0
-            rhr = summary.get("restingHeartRate") or 0
-            stress = summary.get("averageStressLevel") or 0
-            vo2 = summary.get("vo2MaxValue") or 0
-            
-            # Fallback: Training Status
-            if vo2 == 0:
-                try:
-                     logging.info(f"VO2 0 in summary, trying Training Status for {date_str}")
-                     train_status = garmin_client.get_training_status(date_str)
-                     # usually returns dict with 'vo2Max'
-                     if train_status and isinstance(train_status, dict):
-                         vo2 = train_status.get('vo2Max') or 0
-                except Exception as e:
-                     logging.warning(f"Training status failed: {e}")
-            
-            # Body Battery
-            bb_max = 0
-            bb_min = 0
-            if bb_data:
-                # Based on garminconnect returning a list of dicts per day
-                if isinstance(bb_data, list) and len(bb_data) > 0:
-                   first_item = bb_data[0]
-                   if "bodyBatteryValuesArray" in first_item:
-                       # This is the array of [timestamp, level] or similar
-                       vals = [x[1] for x in first_item["bodyBatteryValuesArray"] if len(x) >= 2 and x[1] is not None]
-                       if vals:
-                           bb_max = max(vals)
-                           bb_min = min(vals)
-                   elif "value" in first_item:
-                       vals = [x['value'] for x in bb_data if 'value' in x and x['value'] is not None]
-                       if vals:
-                           bb_max = max(vals)
-                           bb_min = min(vals)
-
-            # Sleep
-            sleep_score = sleep_data.get("dailySleepDTO", {}).get("sleepScores", {}).get("overall", {}).get("value") or 0
-            sleep_sec = sleep_data.get("dailySleepDTO", {}).get("sleepTimeSeconds") or 0
-            sleep_hours = round(sleep_sec / 3600, 2)
-            
-            # HRV
-            hrv_ms = hrv_data.get("hrvSummary", {}).get("weeklyAverage") or 0 # Fallback
-            # Try to get nightly avg
-            if hrv_data.get("hrvSummary", {}).get("lastNightAvg"):
-                hrv_ms = hrv_data.get("hrvSummary", {}).get("lastNightAvg") or 0
-
-            new_row = [
-                date_str,
-                steps,
-                rhr,
-                stress,
-                bb_max,
-                bb_min,
-                sleep_score,
-                sleep_hours,
-                hrv_ms,
-                vo2,
-                active_cal
-            ]
-
-            if date_str in existing_dates:
-                row_idx = next((i for i, row in enumerate(existing_data) if str(row.get("Date")).startswith(date_str)), None)
-                if row_idx is not None:
-                    sheet_row = row_idx + 2
-                    wellness_sheet.update(range_name=f"A{sheet_row}", values=[new_row])
-                    logging.info(f"Updated wellness for {date_str}")
-            else:
-                wellness_rows.append(new_row)
-                logging.info(f"Fetched wellness for {date_str}")
-            
+            results.append((date_str, fetch_wellness_day(garmin_client, date_str)))
         except Exception as e:
             logging.error(f"Failed to fetch/parse wellness for {date_str}: {e}")
-        
-        current_date += datetime.timedelta(days=1)
         # Sleep to avoid rate limits
-        import time
-        time.sleep(2)
+        time.sleep(WELLNESS_DAY_INTERVAL)
+
+    # Sheet writes are collected in date order: existing days overwrite their row, new days append
+    wellness_rows = []
+    row_updates = []
+    for date_str, new_row in results:
+        if date_str in existing_dates:
+            row_updates.append({"range": f"A{date_rows[date_str]}", "values": [new_row]})
+            logging.info(f"Updated wellness for {date_str}")
+        else:
+            wellness_rows.append(new_row)
+            logging.info(f"Fetched wellness for {date_str}")
+
+    # All overwrites in one batch_update request instead of one update per day
+    if row_updates:
+        wellness_sheet.batch_update(row_updates)
 
     if wellness_rows:
         wellness_sheet.append_rows(wellness_rows, value_input_option="USER_ENTERED")
@@ -20,10 +20,10 @@ def _prepare_training_data(df_activ, df_phys):
         return "{}"
         
     six_months_ago = datetime.date.today() - datetime.timedelta(days=180)
-    df_recent = df_activ[df_activ['Date'].dt.date >= six_months_ago].copy()
+    df_recent = df_activ[df_activ['Date'].dt.date >= six_months_ago]
     
     # Filter to runs only
-    df_runs = df_recent[df_recent['NormalizedType'].isin(['running', 'trail_running', 'treadmill_running'])].copy()
+    df_runs = df_recent[df_recent['is_run']].copy()
     if df_runs.empty:
         return '{"message": "No running data in the last 6 months."}'
         
@@ -37,7 +37,8 @@ def _prepare_training_data(df_activ, df_phys):
         if c not in df_runs.columns:
             df_runs[c] = 0
             
-    runs_list = df_runs[export_cols].fillna(0).to_dict(orient='records')
+    # NormalizedType is categorical in load_data; fillna(0) can't add 0 as a category, so export it as text
+    runs_list = df_runs[export_cols].astype({'NormalizedType': str}).fillna(0).to_dict(orient='records')
     
     # Condense physiology (last 30 days of TRIMP/CTL)
     phys_summary = []
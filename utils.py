@@ -3,7 +3,9 @@ import pandas as pd
 import numpy as np
 import datetime
 import os
+import tempfile
 import gspread
+from numba import njit
 from oauth2client.service_account import ServiceAccountCredentials
 from dotenv import load_dotenv
 
@@ -21,11 +23,20 @@ if SHEET_KEY and "docs.google.com" in SHEET_KEY:
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# On-disk copy of the raw Wellness sheet rows, so a fresh process only pulls the new tail
+WELLNESS_CACHE = os.path.join(BASE_DIR, "cache", "wellness.parquet")
+
 # --- Physiology Constants ---
 RHR = 45
 MAX_HR = 197
 HR_RESERVE = MAX_HR - RHR
 
+# Values of the Category column load_data derives from NormalizedType
+ACTIVITY_CATEGORIES = ['running', 'strength', 'walking_hiking', 'other']
+
+# Activity sheet columns the app reads; the rest (IDs, coordinates, speed) are dropped on load
+ACTIVITY_COLUMNS = ['Date', 'Type', 'Distance (km)', 'Elevation Gain (m)', 'Duration (min)', 'Avg HR', 'VO2Max', 'Max Temp', 'Min Temp']
+
 @st.cache_resource
 def get_gspread_client():
     """Authenticate and return gspread client."""
@@ -64,145 +75,394 @@ def get_gspread_client():
         return None
 
 def calculate_trimp(duration_min, avg_hr):
-    """Calculate TRIMP based on HR Reserve zone."""
-    if avg_hr == 0: return 0
+    """Calculate TRIMP based on HR Reserve zone (vectorized over whole columns)."""
+    duration_min = np.asarray(duration_min, dtype=float)
+    avg_hr = np.asarray(avg_hr, dtype=float)
     hrr_factor = (avg_hr - RHR) / HR_RESERVE
     trimp = duration_min * hrr_factor * 0.64 * np.exp(1.92 * hrr_factor)
-    return trimp
+    # Activities without HR data carry no load
+    return np.where(avg_hr == 0, 0.0, trimp)
 
-def load_data():
-    """Load Activity data from Google Sheets (Sheet1)."""
+# Sheet loaders: a cached _fetch_* does the pull and lets API errors propagate, since
+# st.cache_data never stores a call that raised. The public load_* wrapper turns the error
+# into a message plus an empty frame, so a failed pull is retried on the next run instead
+# of being served from the cache for the whole ttl.
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _fetch_activities():
+    """Activity data from Google Sheets (Sheet1), parsed. Raises on API errors."""
     client = get_gspread_client()
     if not client or not SHEET_KEY: return pd.DataFrame()
 
-    try:
-        # Open by Key
-        sh = client.open_by_key(SHEET_KEY)
-        # Assuming Activities are in the first sheet or named 'Sheet1'
-        # sync_garmin.py uses .sheet1 which is the first sheet
-        wks = sh.sheet1
+    # Open by Key
+    sh = client.open_by_key(SHEET_KEY)
+    # Assuming Activities are in the first sheet or named 'Sheet1'
+    # sync_garmin.py uses .sheet1 which is the first sheet
+    wks = sh.sheet1
+    
+    # Fetch only the columns the app reads, as raw strings (no per-cell type guessing);
+    # numeric coercion happens column-wise below
+    header = wks.row_values(1)
+    cols = [c for c in ACTIVITY_COLUMNS if c in header]
+    letters = [gspread.utils.rowcol_to_a1(1, header.index(c) + 1).rstrip('0123456789') for c in cols]
+    ranges = wks.batch_get([f"{l}2:{l}" for l in letters], major_dimension='COLUMNS') if cols else []
+    # The API trims trailing blanks per column, so pad every column to the longest
+    values = [r[0] if r else [] for r in ranges]
+    n_rows = max((len(v) for v in values), default=0)
+    df = pd.DataFrame({c: v + [''] * (n_rows - len(v)) for c, v in zip(cols, values)})
+    
+    if not df.empty:
+        df['Date'] = pd.to_datetime(df['Date'])
+        # Sorted once here so downstream code can rely on chronological order
+        df = df.sort_values("Date", ascending=True, ignore_index=True)
+        # Calendar parts as small ints, so year/month/day filters skip the .dt accessors
+        df['Year'] = df['Date'].dt.year.astype(np.int16)
+        df['Month'] = df['Date'].dt.month.astype(np.int8)
+        df['Day'] = df['Date'].dt.day.astype(np.int8)
+        df['DateOnly'] = df['Date'].dt.normalize()
         
-        data = wks.get_all_records() # Returns list of dicts
-        df = pd.DataFrame(data)
+        # New Extracted Fields from Garmin (May not exist in older rows/sheets)
+        for new_col in ['VO2Max', 'Max Temp', 'Min Temp']:
+            if new_col not in df.columns:
+                df[new_col] = 0
         
-        if not df.empty:
-            df['Date'] = pd.to_datetime(df['Date'])
-            df = df.sort_values("Date", ascending=True)
-            
-            df['Distance (km)'] = pd.to_numeric(df['Distance (km)'], errors='coerce').fillna(0)
-            df['Elevation Gain (m)'] = pd.to_numeric(df['Elevation Gain (m)'], errors='coerce').fillna(0)
-            df['Duration (min)'] = pd.to_numeric(df['Duration (min)'], errors='coerce').fillna(0)
-            df['Avg HR'] = pd.to_numeric(df['Avg HR'], errors='coerce').fillna(0)
-            
-            # New Extracted Fields from Garmin (May not exist in older rows, so we use .get and fillna)
-            for new_col in ['VO2Max', 'Max Temp', 'Min Temp']:
-                if new_col in df.columns:
-                    df[new_col] = pd.to_numeric(df[new_col], errors='coerce').fillna(0)
-                else:
-                    df[new_col] = 0
-            
-            # Pre-calculate TRIMP for each activity row so we can display it in the Activity Feed
-            df['TRIMP'] = df.apply(lambda row: calculate_trimp(row['Duration (min)'], row['Avg HR']), axis=1)
-            
-            # Normalize types
-            df['NormalizedType'] = df['Type'].apply(lambda x: 'running' if 'running' in str(x).lower() else str(x).lower())
-            
-        return df
+        # Coerce every numeric column in one pass
+        num_cols = ['Distance (km)', 'Elevation Gain (m)', 'Duration (min)', 'Avg HR', 'VO2Max', 'Max Temp', 'Min Temp']
+        df[num_cols] = df[num_cols].apply(pd.to_numeric, errors='coerce').fillna(0)
+        
+        # Activity end times for timelines: Date + duration, one vectorized timedelta
+        df['End'] = df['Date'] + pd.to_timedelta(df['Duration (min)'].to_numpy(), unit='m')
+        
+        # Pre-calculate TRIMP for each activity row so we can display it in the Activity Feed
+        df['TRIMP'] = calculate_trimp(df['Duration (min)'], df['Avg HR'])
+        
+        # Normalize types: lowercase, and fold every running variant into 'running'
+        type_lower = df['Type'].astype(str).str.lower()
+        df['NormalizedType'] = np.where(type_lower.str.contains('running', regex=False), 'running', type_lower)
+        # Few distinct values: category dtype turns filters into integer code comparisons
+        df['Type'] = df['Type'].astype('category')
+        df['NormalizedType'] = df['NormalizedType'].astype('category')
+        
+        # Activity-type flags and a single Category, computed once so every filter is
+        # a plain boolean index or one categorical equality
+        nt = df['NormalizedType']
+        df['is_run'] = nt == 'running'
+        df['is_strength'] = nt.str.contains('strength', regex=False, na=False).astype(bool)
+        is_walk_hike = nt.str.contains('walking|hiking', na=False).astype(bool)
+        df['Category'] = pd.Categorical(
+            np.select([df['is_run'], df['is_strength'], is_walk_hike], ['running', 'strength', 'walking_hiking'], 'other'),
+            categories=ACTIVITY_CATEGORIES,
+        )
+        
+    return df
+
+def load_data():
+    """Load Activity data from Google Sheets (Sheet1). Cached so reruns skip the fetch and parse."""
+    try:
+        return _fetch_activities()
     except Exception as e:
         masked_key = SHEET_KEY[:5] + "..." if SHEET_KEY else "None"
         st.error(f"Error loading activity data with Key '{masked_key}': {e}")
         return pd.DataFrame()
 
-def load_wellness_data():
-    """Load Wellness data from Google Sheets (Worksheet: Wellness)."""
+load_data.clear = _fetch_activities.clear
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _split_by_category():
+    df = _fetch_activities()
+    by_cat = {"All": df}
+    if not df.empty:
+        by_cat.update({cat: df[df['Category'] == cat] for cat in ACTIVITY_CATEGORIES})
+    return by_cat
+
+def load_data_by_category():
+    """load_data() pre-split by Category, plus 'All' -> the full frame, so activity filters are dict lookups."""
+    try:
+        return _split_by_category()
+    except Exception:
+        return {"All": load_data()} # load_data reports the failure and returns an empty frame
+
+load_data_by_category.clear = _split_by_category.clear
+
+EMPTY_YEAR_STATS = dict(run_km=0.0, hm=0, active=0, strength=0)
+
+def _year_stats(dy):
+    """Project totals for one year's activities; NumPy reductions over boolean masks."""
+    dist = dy['Distance (km)'].to_numpy()
+    run = dy['is_run'].to_numpy()
+    return dict(
+        run_km=float(np.nansum(dist[run])),
+        hm=int((run & (dist >= 21.09)).sum()),
+        active=dy['DateOnly'].nunique(),
+        strength=int(dy['is_strength'].to_numpy().sum()),
+    )
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _compute_year_stats():
+    df = _fetch_activities()
+    if df.empty: return {}
+    return {int(year): _year_stats(dy) for year, dy in df.groupby('Year', sort=False)}
+
+def load_year_stats():
+    """{year: totals} for the Project Totals block, computed once per load_data refresh."""
+    try:
+        return _compute_year_stats()
+    except Exception:
+        return {} # the activity loader reports the failure
+
+load_year_stats.clear = _compute_year_stats.clear
+
+def _wellness_rows(wks):
+    """
+    Raw Wellness rows (strings) with the Parquet copy at WELLNESS_CACHE as the base. The copy
+    is trusted only while the sheet's header matches and its Date column still starts with the
+    cached dates (no rows moved, inserted or deleted); then just the last cached row onward is
+    fetched, since sync overwrites the latest day and appends after it. Otherwise a full pull.
+    """
+    cached = None
+    try:
+        cached = pd.read_parquet(WELLNESS_CACHE)
+    except Exception:
+        pass # missing, unreadable or no parquet engine: full pull
+
+    df = None
+    if cached is not None and len(cached):
+        cols = list(cached.columns)
+        n = len(cached)
+        # Header and Date column in one request; the API trims blank trailing cells
+        header_rows, date_rows = wks.batch_get(['1:1', 'A2:A'])
+        header = header_rows[0] if header_rows else []
+        dates = [r[0] if r else '' for r in date_rows]
+        if header == cols and len(dates) >= n and dates[:n] == cached.iloc[:, 0].tolist():
+            tail = wks.get(f"A{n + 1}:{gspread.utils.rowcol_to_a1(1, len(cols)).rstrip('0123456789')}")
+            tail = pd.DataFrame([r + [''] * (len(cols) - len(r)) for r in tail], columns=cols)
+            df = pd.concat([cached.iloc[:-1], tail], ignore_index=True)
+    if df is None:
+        values = wks.get_all_values()
+        if len(values) < 2: return pd.DataFrame()
+        df = pd.DataFrame(values[1:], columns=values[0])
+
+    try:
+        cache_dir = os.path.dirname(WELLNESS_CACHE)
+        os.makedirs(cache_dir, exist_ok=True)
+        # Written beside the cache and swapped in, so a concurrent rerun never reads a torn file
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            df.to_parquet(tmp_path, compression='zstd', index=False)
+            os.replace(tmp_path, WELLNESS_CACHE)
+        finally:
+            if os.path.exists(tmp_path): os.remove(tmp_path)
+    except Exception:
+        pass # the cache is an optimization only
+    return df
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _fetch_wellness():
+    """Wellness data from Google Sheets (Worksheet: Wellness), parsed. Raises on API errors."""
     client = get_gspread_client()
     if not client or not SHEET_KEY: return pd.DataFrame()
 
+    sh = client.open_by_key(SHEET_KEY)
     try:
-        sh = client.open_by_key(SHEET_KEY)
-        try:
-            wks = sh.worksheet("Wellness")
-        except gspread.exceptions.WorksheetNotFound:
-            st.warning("Wellness worksheet not found. Please sync data first.")
-            return pd.DataFrame()
-            
-        data = wks.get_all_records()
-        df = pd.DataFrame(data)
+        wks = sh.worksheet("Wellness")
+    except gspread.exceptions.WorksheetNotFound:
+        st.warning("Wellness worksheet not found. Please sync data first.")
+        return pd.DataFrame()
         
-        if not df.empty:
-            df['Date'] = pd.to_datetime(df['Date'])
-            df = df.sort_values("Date", ascending=True)
-            # Ensure numeric
-            cols = ["Steps", "RHR", "Stress_Avg", "BodyBattery_Max", "BodyBattery_Min", "Sleep_Score", "Sleep_Hours", "HRV_ms", "VO2Max", "ActiveKilocalories"]
-            for c in cols:
-                if c in df.columns:
-                    df[c] = pd.to_numeric(df[c], errors='coerce').fillna(0)
-        return df
+    df = _wellness_rows(wks)
+    
+    if not df.empty:
+        df['Date'] = pd.to_datetime(df['Date'])
+        df = df.sort_values("Date", ascending=True, ignore_index=True)
+        # Ensure numeric, narrowed: 0-255 scores as int16 (signed, so day-over-day deltas
+        # can go negative), step counts int32, fractional metrics float32
+        col_dtypes = {
+            "Steps": np.int32, "RHR": np.int16, "Stress_Avg": np.int16, "BodyBattery_Max": np.int16,
+            "BodyBattery_Min": np.int16, "Sleep_Score": np.int16, "Sleep_Hours": np.float32,
+            "HRV_ms": np.float32, "VO2Max": np.float32, "ActiveKilocalories": np.float32,
+        }
+        for c, dtype in col_dtypes.items():
+            if c in df.columns:
+                num = pd.to_numeric(df[c], errors='coerce').fillna(0)
+                df[c] = (num.round() if np.issubdtype(dtype, np.integer) else num).astype(dtype)
+    return df
+
+def load_wellness_data():
+    """Load Wellness data from Google Sheets (Worksheet: Wellness)."""
+    try:
+        return _fetch_wellness()
     except Exception as e:
         st.error(f"Wellness data error: {e}") 
         return pd.DataFrame()
 
-def load_intraday_data():
-    """Load Intraday Wellness data from Google Sheets (Worksheet: Wellness_Intraday)."""
+load_wellness_data.clear = _fetch_wellness.clear
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _fetch_intraday():
+    """Intraday Wellness data from Google Sheets (Worksheet: Wellness_Intraday), parsed. Raises on API errors."""
     client = get_gspread_client()
     if not client or not SHEET_KEY: return pd.DataFrame()
 
+    sh = client.open_by_key(SHEET_KEY)
     try:
-        sh = client.open_by_key(SHEET_KEY)
-        try:
-            wks = sh.worksheet("Wellness_Intraday")
-        except gspread.exceptions.WorksheetNotFound:
-            # Silent fail if not yet synced, just return empty
-            return pd.DataFrame()
-            
-        data = wks.get_all_records()
-        df = pd.DataFrame(data)
+        wks = sh.worksheet("Wellness_Intraday")
+    except gspread.exceptions.WorksheetNotFound:
+        # Silent fail if not yet synced, just return empty
+        return pd.DataFrame()
         
-        if not df.empty:
-            # Parse Dates/Timestamps
-            # 'Timestamp' is ISO format
-            if 'Timestamp' in df.columns:
-                df['Timestamp'] = pd.to_datetime(df['Timestamp'], format='mixed', utc=True)
-            if 'Date' in df.columns:
-                df['Date'] = pd.to_datetime(df['Date'], format='mixed', utc=True)
-            if 'EndTimestamp' in df.columns:
-                df['EndTimestamp'] = pd.to_datetime(df['EndTimestamp'], format='mixed', utc=True)
-                
-            # Ensure Numeric Value
-            if 'Value' in df.columns:
-                 df['Value'] = pd.to_numeric(df['Value'], errors='coerce')
-                 
-        return df
+    data = wks.get_all_records()
+    df = pd.DataFrame(data)
+    
+    if not df.empty:
+        # Parse Dates/Timestamps
+        # 'Timestamp' is ISO format
+        if 'Timestamp' in df.columns:
+            df['Timestamp'] = pd.to_datetime(df['Timestamp'], format='mixed', utc=True)
+        if 'Date' in df.columns:
+            df['Date'] = pd.to_datetime(df['Date'], format='mixed', utc=True)
+        if 'EndTimestamp' in df.columns:
+            df['EndTimestamp'] = pd.to_datetime(df['EndTimestamp'], format='mixed', utc=True)
+        if 'Timestamp' in df.columns:
+            # Sorted once here so time windows are binary searches, not full-column masks
+            df = df.sort_values('Timestamp', ignore_index=True)
+            
+        # Ensure Numeric Value
+        if 'Value' in df.columns:
+             df['Value'] = pd.to_numeric(df['Value'], errors='coerce').astype(np.float32)
+        # A handful of metric names: category codes make the per-Type split an integer groupby
+        if 'Type' in df.columns:
+            df['Type'] = df['Type'].astype('category')
+             
+    return df
+
+def load_intraday_data():
+    """Load Intraday Wellness data from Google Sheets (Worksheet: Wellness_Intraday)."""
+    try:
+        return _fetch_intraday()
     except Exception as e:
         print(f"DEBUG ERROR: {e}")
         return pd.DataFrame()
 
-def calculate_physiology(df):
-    """Calculate CTL, ATL, TSB from activity dataframe."""
+load_intraday_data.clear = _fetch_intraday.clear
+
+@st.cache_resource(ttl=600, show_spinner=False)
+def _split_intraday():
+    """
+    Intraday data split by metric: {Type: frame}, so charts look a metric up instead of
+    scanning the long table. Each frame keeps only Timestamp/Value (plus EndTimestamp for
+    SleepStage) and stays sorted by Timestamp.
+    A cache_resource: one shared copy for every session and page, not unpickled per call,
+    so callers must treat the frames as read-only (slice, never assign).
+    """
+    df = _fetch_intraday()
+    if df.empty or 'Type' not in df.columns: return {}
+    by_type = {}
+    for kind, g in df.groupby('Type', sort=False, observed=True):
+        cols = ['Timestamp', 'Value'] + (['EndTimestamp'] if kind == 'SleepStage' and 'EndTimestamp' in g.columns else [])
+        g = g[cols].reset_index(drop=True)
+        # Whole-number metrics (HR, stress, steps, stage codes) fit int16; Respiration etc. stay float32
+        v = g['Value'].to_numpy()
+        if len(v) and np.isfinite(v).all() and (v == np.round(v)).all() and np.abs(v).max() < 2**15:
+            g['Value'] = v.astype(np.int16)
+        by_type[kind] = g
+    return by_type
+
+def load_intraday_by_type():
+    """load_intraday_data() as {Type: frame}; see _split_intraday. Empty on a failed pull, which is not cached."""
+    try:
+        return _split_intraday()
+    except Exception:
+        return {} # load_intraday_data reports the failure
+
+load_intraday_by_type.clear = _split_intraday.clear
+
+@njit(cache=True, fastmath=True)
+def banister_pmc(trimp, ctl_span=42, atl_span=7):
+    """
+    CTL/ATL as adjust=False EWMAs of daily TRIMP plus TSB, in one pass.
+    y[t] = a*x[t] + (1-a)*y[t-1] with a = 2/(span+1), same as pandas ewm(adjust=False).
+    """
+    n = trimp.shape[0]
+    ctl = np.empty(n)
+    atl = np.empty(n)
+    tsb = np.empty(n)
+    if n == 0:
+        return ctl, atl, tsb
+    a_ctl = 2.0 / (ctl_span + 1.0)
+    a_atl = 2.0 / (atl_span + 1.0)
+    ctl[0] = trimp[0]
+    atl[0] = trimp[0]
+    tsb[0] = 0.0
+    for i in range(1, n):
+        ctl[i] = a_ctl * trimp[i] + (1.0 - a_ctl) * ctl[i - 1]
+        atl[i] = a_atl * trimp[i] + (1.0 - a_atl) * atl[i - 1]
+        tsb[i] = ctl[i] - atl[i]
+    return ctl, atl, tsb
+
+# Compile (or load the on-disk cache) at import so the first PMC render doesn't pay for it
+banister_pmc(np.zeros(2))
+
+def frame_signature(d):
+    """Cheap cache key for activity/PMC frames: row count, last Date and the TRIMP/distance/duration totals."""
+    if d.empty: return (0,)
+    sums = tuple(float(d[c].sum()) if c in d.columns else None for c in ('TRIMP', 'Distance (km)', 'Duration (min)'))
+    return (len(d), d['Date'].max()) + sums
+
+# Cached functions that take an activity or PMC frame key on frame_signature, not a full-frame hash
+FRAME_HASH_FUNCS = {pd.DataFrame: frame_signature}
+
+def _physiology(df, today):
+    """CTL, ATL, TSB per day from an activity frame, extended to today; None if empty."""
     if df.empty: return None
 
-    df_phys = df.copy().sort_values("Date")
-    df_phys['TRIMP'] = df_phys.apply(lambda row: calculate_trimp(row['Duration (min)'], row['Avg HR']), axis=1)
+    # load_data already computes TRIMP (vectorized); only derive it for frames that lack it
+    trimp = df['TRIMP'].to_numpy() if 'TRIMP' in df.columns else calculate_trimp(df['Duration (min)'], df['Avg HR'])
     
-    # Resample
-    df_phys = df_phys.set_index('Date').resample('D')['TRIMP'].sum()
+    # Resample a bare Series (no intermediate frame, copy or sort; resample bins unsorted input)
+    daily = pd.Series(trimp, index=pd.DatetimeIndex(df['Date'])).resample('D').sum()
     
     # Extend to today
-    last_date = df_phys.index.max().date()
-    today = datetime.date.today()
+    last_date = daily.index.max().date()
     if last_date < today:
-        full_idx = pd.date_range(start=df_phys.index.min(), end=today, freq='D')
-        df_phys = df_phys.reindex(full_idx, fill_value=0)
-    
-    df_phys = df_phys.reset_index().rename(columns={'index': 'Date'})
+        full_idx = pd.date_range(start=daily.index.min(), end=today, freq='D')
+        daily = daily.reindex(full_idx, fill_value=0)
     
     # Calculate EWMA
-    df_phys['CTL'] = df_phys['TRIMP'].ewm(span=42, adjust=False).mean()
-    df_phys['ATL'] = df_phys['TRIMP'].ewm(span=7, adjust=False).mean()
-    df_phys['TSB'] = df_phys['CTL'] - df_phys['ATL']
+    daily_trimp = daily.to_numpy(dtype=np.float64)
+    ctl, atl, tsb = banister_pmc(daily_trimp)
+    df_phys = pd.DataFrame({'Date': daily.index, 'TRIMP': daily_trimp, 'CTL': ctl, 'ATL': atl, 'TSB': tsb})
     
     return df_phys
 
+# Cached so widget-triggered reruns reuse the PMC instead of re-running resample/ewm;
+# the day is part of the key because the series is extended to today
+@st.cache_data(ttl=600, max_entries=16, hash_funcs=FRAME_HASH_FUNCS)
+def _cached_physiology(df, today):
+    return _physiology(df, today)
+
+def calculate_physiology(df):
+    """Calculate CTL, ATL, TSB from activity dataframe."""
+    return _cached_physiology(df, datetime.date.today())
+
+# Persisted to disk so server restarts reuse the PMC. Persistent caches ignore ttl, so the
+# day is part of the key instead (the series is extended to today) and max_entries bounds it.
+@st.cache_data(persist="disk", max_entries=16, hash_funcs=FRAME_HASH_FUNCS)
+def _compute_pmc(df, today):
+    # Uncached inner call: this entry is stored under today's key, so it must be built for today
+    df_phys = _physiology(df, today)
+    current = df_phys.iloc[-1]
+    curr_ctl, curr_atl, curr_tsb = float(current['CTL']), float(current['ATL']), float(current['TSB'])
+    load_ratio = curr_atl / curr_ctl if curr_ctl > 0 else 0
+    return df_phys, curr_ctl, curr_atl, curr_tsb, load_ratio
+
+def compute_pmc(df):
+    """
+    PMC series plus today's CTL, ATL, TSB and ATL/CTL load ratio.
+    Keyed on the cheap frame_signature fingerprint instead of hashing every cell.
+    """
+    return _compute_pmc(df, datetime.date.today())
+
 def get_metadata(key, default=None):
     """Get a value from the Metadata sheet."""
     client = get_gspread_client()
@@ -262,81 +522,21 @@ def save_training_plan(plan_json_str):
 def load_training_plan():
     return get_metadata("TrainingPlan")
 
+@st.cache_resource
+def get_css(name):
+    """Stylesheet styles/<name> wrapped in a style tag, read once per process."""
+    with open(os.path.join(BASE_DIR, "styles", name), encoding="utf-8") as f:
+        return f"<style>\n{f.read()}</style>\n"
+
 def render_sticky_nav(current_page="dashboard"):
     """Renders a sticky top navbar for seamless page switching."""
-    st.markdown("""
-    <style>
-        /* Hide the Streamlit native header and sidebar toggle */
-        [data-testid="stHeader"] { display: none; }
-        
-        /* Create our custom sticky navbar area */
-        .sticky-nav {
-            position: fixed;
-            top: 0;
-            left: 0;
-            width: 100%;
-            background-color: rgba(14, 17, 23, 0.95);
-            backdrop-filter: blur(10px);
-            z-index: 99999;
-            display: flex;
-            justify-content: center;
-            gap: 15px;
-            padding: 15px 0;
-            border-bottom: 1px solid #2d2d2d;
-            flex-wrap: wrap; /* allow wrapping on super tiny screens */
-        }
-        
-        .sticky-nav a {
-            color: #b0b0b0;
-            text-decoration: none;
-            font-weight: 600;
-            font-size: 16px;
-            transition: color 0.3s, transform 0.3s;
-            padding: 5px 10px;
-            border-radius: 5px;
-        }
-        
-        .sticky-nav a:hover {
-            color: #00ff7f; /* Neon green */
-            background-color: rgba(0, 255, 127, 0.1);
-        }
-        
-        .sticky-nav a.active {
-            color: #00ff7f;
-            border-bottom: 2px solid #00ff7f;
-            border-radius: 0;
-        }
-
-        /* Top padding for main container */
-        .block-container {
-            padding-top: 80px !important;
-        }
-        
-        /* Mobile Specific Overrides for Navbar */
-        @media (max-width: 600px) {
-            .sticky-nav a {
-                font-size: 14px;
-                padding: 4px 6px;
-            }
-            .sticky-nav {
-                gap: 5px;
-                padding: 10px 0;
-            }
-            .block-container {
-                padding-top: 60px !important;
-            }
-        }
-    </style>
-    """, unsafe_allow_html=True)
-
     dh_active = "class='active'" if current_page == "dashboard" else ""
     ph_active = "class='active'" if current_page == "Personal_History" else ""
     tp_active = "class='active'" if current_page == "Training_Plan" else ""
     
-    st.markdown(f"""
-    <div class="sticky-nav">
-        <a href="/" target="_self" {dh_active}>🏋️ Training Hub</a>
-        <a href="/Personal_History" target="_self" {ph_active}>🧘 Personal History</a>
-        <a href="/Training_Plan" target="_self" {tp_active}>🧬 Training Plan Engine</a>
-    </div>
-    """, unsafe_allow_html=True)
+    # Stylesheet and links go out as a single markdown element
+    st.markdown(get_css("sticky_nav.css") + f"""<div class="sticky-nav">
+<a href="/" target="_self" {dh_active}>🏋️ Training Hub</a>
+<a href="/Personal_History" target="_self" {ph_active}>🧘 Personal History</a>
+<a href="/Training_Plan" target="_self" {tp_active}>🧬 Training Plan Engine</a>
+</div>""", unsafe_allow_html=True)